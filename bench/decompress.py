@@ -0,0 +1,129 @@
+import hashlib
+import io
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+from lib.lib import _DECOMPRESS_COMMANDS, extract
+
+_SIZES_MB = (8, 32, 64)
+_RUNS = 3
+
+
+def _payload(size: int, seed: int) -> bytes:
+    # half random, half zeros per 4KiB block, roughly as compressible as a binary
+    rng = random.Random(seed)
+    return b"".join(rng.randbytes(2048) + bytes(2048) for _ in range(size // 4096))
+
+
+def _write_tar(tar_path: Path, size_mb: int):
+    # a few files of different sizes, like a release with a binary and its docs
+    with tarfile.open(tar_path, "w") as tar:
+        for i, share in enumerate((0.9, 0.08, 0.02)):
+            data = _payload(int(size_mb * 1024 * 1024 * share), i)
+            info = tarfile.TarInfo(f"tool-{size_mb}/file{i}")
+            info.size = len(data)
+            info.mode = 0o755
+            tar.addfile(info, io.BytesIO(data))
+
+
+def _compress(tar_path: Path) -> dict[str, Path]:
+    archives = {}
+    gz_path = tar_path.with_suffix(".tar.gz")
+    with open(tar_path, "rb") as f, open(gz_path, "wb") as out:
+        subprocess.run(["gzip", "-c"], stdin=f, stdout=out, check=True)
+    archives["gz"] = gz_path
+    for name, suffix, cmd in (
+        ("xz", ".tar.xz", ["xz", "-T0", "-c"]),
+        ("zst", ".tar.zst", ["zstd", "-c", "-q"]),
+    ):
+        if not shutil.which(cmd[0]):
+            continue
+        path = tar_path.with_suffix(suffix)
+        with open(tar_path, "rb") as f, open(path, "wb") as out:
+            subprocess.run(cmd, stdin=f, stdout=out, check=True)
+        archives[name] = path
+    return archives
+
+
+def _tree_digest(root: Path) -> str:
+    digest = hashlib.sha256()
+    for path in sorted(root.rglob("*")):
+        digest.update(str(path.relative_to(root)).encode())
+        digest.update(str(path.stat().st_mode).encode())
+        if path.is_file():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _extract(archive: Path, extract_path: Path, backend: str) -> float:
+    os.environ["MISE_ANIAAN_DECOMPRESS"] = backend
+    shutil.rmtree(extract_path, ignore_errors=True)
+    extract_path.mkdir()
+    start = time.perf_counter()
+    extract(download_path=archive, extract_path=extract_path, bin_path="")
+    return time.perf_counter() - start
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or _SIZES_MB
+
+    print(
+        f"{'size':>8} {'format':>7} {'backend':>8} {'archive':>10}"
+        f" {'extract':>10} {'MB/s':>8} {'identical':>10}"
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        extract_path = tmp_path / "out"
+        for size_mb in sizes:
+            tar_path = tmp_path / f"tool-{size_mb}.tar"
+            _write_tar(tar_path, size_mb)
+            tar_size = tar_path.stat().st_size
+
+            # every backend must reproduce the uncompressed tar extracted by tarfile
+            shutil.rmtree(extract_path, ignore_errors=True)
+            with tarfile.open(tar_path) as tar:
+                tar.extractall(extract_path, filter="data")
+            reference = _tree_digest(extract_path)
+
+            for compression, archive in _compress(tar_path).items():
+                backends = ["stdlib", "system"] if compression != "zst" else ["system"]
+                if not shutil.which(_DECOMPRESS_COMMANDS[compression][0]):
+                    backends.remove("system")
+
+                for backend in backends:
+                    elapsed = min(
+                        _extract(archive, extract_path, backend) for _ in range(_RUNS)
+                    )
+                    digest = _tree_digest(extract_path)
+                    label = (
+                        _DECOMPRESS_COMMANDS[compression][0]
+                        if backend == "system"
+                        else backend
+                    )
+                    print(
+                        f"{size_mb:>6}MB {compression:>7} {label:>8}"
+                        f" {archive.stat().st_size / 1024 / 1024:>8.1f}MB"
+                        f" {elapsed * 1000:>8.1f}ms"
+                        f" {tar_size / 1024 / 1024 / elapsed:>8.1f}"
+                        f" {'yes' if digest == reference else 'NO':>10}"
+                    )
+                    if digest != reference:
+                        raise Exception(f"{backend} output differs for {archive.name}")
+
+            for path in tmp_path.glob(f"tool-{size_mb}.tar*"):
+                path.unlink()
+
+
+if __name__ == "__main__":
+    main()
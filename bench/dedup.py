@@ -0,0 +1,97 @@
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+_TMP = tempfile.TemporaryDirectory(prefix="mise-aniaan-dedup-")
+os.environ["MISE_ANIAAN_CACHE_DIR"] = str(Path(_TMP.name) / "cache")
+
+import lib.lib as lib  # noqa: E402
+
+_FILES = 2000
+_SIZE_MB = 64
+_VERSIONS = 4
+_CHANGED = 0.05
+
+
+def _write_tree(root: Path, version: int, sizes: list[int]):
+    # like a toolchain's lib/ or runtime/: most files identical across versions
+    for i, size in enumerate(sizes):
+        path = root / f"lib/dir{i % 50}/file{i}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        changed = random.Random(i).random() < _CHANGED
+        seed = f"{i}-{version}" if changed else str(i)
+        path.write_bytes(random.Random(seed).randbytes(size))
+        path.chmod(0o755 if i % 10 == 0 else 0o644)
+
+
+def _disk_usage(roots: list[Path]) -> int:
+    # hardlinked files are only counted once, like du
+    seen, total = set(), 0
+    for root in roots:
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                st = os.lstat(os.path.join(dirpath, name))
+                if (st.st_dev, st.st_ino) not in seen:
+                    seen.add((st.st_dev, st.st_ino))
+                    total += st.st_blocks * 512
+    return total
+
+
+def main():
+    # python bench/dedup.py [FILES] [SIZE_MB]
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else _FILES
+    size_mb = float(sys.argv[2]) if len(sys.argv) > 2 else _SIZE_MB
+    rng = random.Random(0)
+    weights = [rng.paretovariate(1.2) for _ in range(files)]
+    sizes = [max(1, int(w / sum(weights) * size_mb * 1024 * 1024)) for w in weights]
+
+    work = Path(_TMP.name)
+    installs = []
+    print(
+        f"{files} files, {size_mb:g}MB per version, {_CHANGED:.0%} changed per version"
+    )
+    print(
+        f"{'version':>8} {'dedup':>10} {'linked':>8}"
+        f" {'disk, plain':>12} {'disk, dedup':>12}"
+    )
+    for version in range(1, _VERSIONS + 1):
+        plain = work / f"plain/{version}"
+        deduped = work / f"dedup/{version}"
+        _write_tree(plain, version, sizes)
+        shutil.copytree(plain, deduped)
+        installs.append(deduped)
+
+        start = time.perf_counter()
+        linked, _ = lib.dedup_tree(deduped)
+        elapsed = time.perf_counter() - start
+
+        plain_usage = _disk_usage([work / "plain"])
+        dedup_usage = _disk_usage([work / "dedup", lib._store_dir()])
+        print(
+            f"{version:>8} {elapsed * 1000:>8.1f}ms {linked:>8}"
+            f" {plain_usage / 1024 / 1024:>10.1f}MB"
+            f" {dedup_usage / 1024 / 1024:>10.1f}MB"
+        )
+
+    # uninstalling the first version leaves only its changed files unreferenced
+    shutil.rmtree(installs[0])
+    removed, freed = lib.gc_store()
+    print(f"gc after removing version 1: {removed} blobs, {freed / 1024 / 1024:.1f}MB")
+    for root in installs[1:]:
+        shutil.rmtree(root)
+    removed, freed = lib.gc_store()
+    print(
+        f"gc after removing all versions: {removed} blobs, {freed / 1024 / 1024:.1f}MB"
+    )
+
+
+if __name__ == "__main__":
+    main()
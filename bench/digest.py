@@ -0,0 +1,64 @@
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+from lib.lib import file_digest
+
+_SIZES_MB = (10, 100, 500)
+
+
+def _subprocess_digest(file_path: Path) -> str:
+    cmd = ["shasum", "-a", "256"] if shutil.which("shasum") else ["sha256sum"]
+    result = subprocess.run([*cmd, file_path], capture_output=True, text=True)
+    return result.stdout.split()[0]
+
+
+def _time(func, *args) -> tuple[float, str]:
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def _write_file(file_path: Path, size_mb: int):
+    chunk = os.urandom(1024 * 1024)
+    with open(file_path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(chunk)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or _SIZES_MB
+    has_subprocess = bool(shutil.which("shasum") or shutil.which("sha256sum"))
+
+    print(f"{'size':>8} {'algorithm':>10} {'in-process':>12} {'subprocess':>12}")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in sizes:
+            file_path = Path(tmp_dir) / f"{size_mb}mb.bin"
+            _write_file(file_path, size_mb)
+
+            for algorithm in ("sha256", "sha512", "blake2b"):
+                elapsed, actual = _time(file_digest, file_path, algorithm)
+                subprocess_column = "-"
+                if algorithm == "sha256" and has_subprocess:
+                    sub_elapsed, expected = _time(_subprocess_digest, file_path)
+                    if actual != expected:
+                        raise Exception(f"digest mismatch: {actual} != {expected}")
+                    subprocess_column = f"{sub_elapsed * 1000:.1f}ms"
+                print(
+                    f"{size_mb:>6}MB {algorithm:>10} {elapsed * 1000:>10.1f}ms"
+                    f" {subprocess_column:>12}"
+                )
+
+            file_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import contextlib
+import io
+import json
+import os
+import socket
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# lib.lib reads these at import time, so the fake server's port is fixed up front
+_PORT = _free_port()
+_TMP = tempfile.TemporaryDirectory(prefix="mise-aniaan-e2e-")
+os.environ.update(
+    {
+        "MISE_ANIAAN_API_URL": f"http://127.0.0.1:{_PORT}/api",
+        "MISE_ANIAAN_GITHUB_URL": f"http://127.0.0.1:{_PORT}",
+        "MISE_ANIAAN_CACHE_DIR": str(Path(_TMP.name) / "cache"),
+        "MISE_ANIAAN_ARTIFACT_CACHE": "0",
+        "MISE_ANIAAN_TRACE": str(Path(_TMP.name) / "trace.jsonl"),
+        "NO_PROXY": "127.0.0.1",
+        "no_proxy": "127.0.0.1",
+    }
+)
+
+import lib.lib as lib  # noqa: E402
+from bench.fake_github import VERSION, FakeGitHub, all_plugins, supported  # noqa: E402
+
+_RUNS = 3
+_SIZE_MB = 8.0
+_PHASES = (
+    "list_cold",
+    "list_warm",
+    "resolve",
+    "checksum_fetch",
+    "download",
+    "verify",
+    "extract",
+    "copy",
+    "install",
+)
+
+
+def _read_spans(trace_path: Path) -> list[dict]:
+    if not trace_path.exists():
+        return []
+    with open(trace_path) as f:
+        spans = [json.loads(line) for line in f]
+    trace_path.unlink()
+    return spans
+
+
+def _phases(spans: list[dict]) -> dict[str, float]:
+    # top-level phases of the install, checksum_fetch overlaps the asset download
+    install = next(s for s in spans if s["span"] == "install")
+    lists = [s for s in spans if s["span"] == "list"]
+    phases = {
+        "list_cold": lists[0]["duration_ms"],
+        "list_warm": lists[1]["duration_ms"],
+        "install": install["duration_ms"],
+    }
+    for s in spans:
+        if s["parent"] == install["id"]:
+            phases[s["span"]] = phases.get(s["span"], 0.0) + s["duration_ms"]
+    return phases
+
+
+def _run_once(plugin: lib.Plugin, work_dir: Path) -> dict[str, float]:
+    trace_path = Path(os.environ["MISE_ANIAAN_TRACE"])
+    lib._release_cache_path(plugin.repo_name).unlink(missing_ok=True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        versions = lib.list_version(plugin.name)
+        if VERSION not in versions:
+            raise Exception(f"{plugin.name}: {VERSION} missing from list output")
+        lib.list_version(plugin.name)
+
+        install_path = work_dir / plugin.name
+        lib.install_version(plugin.name, VERSION, str(install_path))
+        lib.shutil.rmtree(install_path)
+    return _phases(_read_spans(trace_path))
+
+
+def _ms(duration_ms: float | None) -> str:
+    return "-" if duration_ms is None else f"{duration_ms:.1f}"
+
+
+def main():
+    # python bench/e2e.py [plugin ...] [--size-mb N] [--runs N] [--drop-after FRACTION]
+    #                     [--throttle-mbps N]
+    args = sys.argv[1:]
+    size_mb, runs, drop_after, throttle = _SIZE_MB, _RUNS, 0.0, 0.0
+    if "--size-mb" in args:
+        i = args.index("--size-mb")
+        size_mb = float(args[i + 1])
+        del args[i : i + 2]
+    if "--runs" in args:
+        i = args.index("--runs")
+        runs = int(args[i + 1])
+        del args[i : i + 2]
+    if "--drop-after" in args:
+        # every full download is cut at this fraction and has to be resumed
+        i = args.index("--drop-after")
+        drop_after = float(args[i + 1])
+        del args[i : i + 2]
+    if "--throttle-mbps" in args:
+        # cap each connection, MISE_ANIAAN_CONNECTIONS>1 shows the ranged speedup
+        i = args.index("--throttle-mbps")
+        throttle = float(args[i + 1]) * 1024 * 1024
+        del args[i : i + 2]
+
+    plugins = [lib.get_plugin(name) for name in args] if args else all_plugins()
+    selected = []
+    for plugin in plugins:
+        ok, reason = supported(plugin)
+        if ok:
+            selected.append(plugin)
+        else:
+            print(f"skipping {plugin.name}: {reason}", file=sys.stderr)
+
+    fake = FakeGitHub(
+        selected,
+        int(size_mb * 1024 * 1024),
+        port=_PORT,
+        drop_after=drop_after,
+        throttle=throttle,
+    )
+    fake.start()
+    work_dir = Path(_TMP.name) / "installs"
+    work_dir.mkdir()
+
+    rows = []
+    failed = False
+    for plugin in selected:
+        release = fake.releases[plugin.repo_name]
+        asset_size = max(len(data) for data in release.assets.values())
+        try:
+            samples = [_run_once(plugin, work_dir) for _ in range(runs)]
+        except Exception as e:
+            print(f"{plugin.name}: failed: {e}", file=sys.stderr)
+            _read_spans(Path(os.environ["MISE_ANIAAN_TRACE"]))
+            failed = True
+            continue
+        medians = {
+            phase: statistics.median(s.get(phase, 0.0) for s in samples)
+            for phase in _PHASES
+            if any(phase in s for s in samples)
+        }
+        rows.append((plugin.name, release.kind, asset_size, medians))
+
+    header = f"{'plugin':>20} {'type':>7} {'asset':>8}" + "".join(
+        f" {p:>10}" for p in _PHASES
+    )
+    print(f"median of {runs} runs, {size_mb:g}MB payload, times in ms")
+    print(
+        "checksum_fetch overlaps the download, "
+        "streamed tarballs extract inside download"
+    )
+    print(header + f" {'MB/s':>8}")
+    for name, kind, asset_size, medians in rows:
+        line = f"{name:>20} {kind:>7} {asset_size / 1024 / 1024:>6.2f}MB"
+        line += "".join(f" {_ms(medians.get(p)):>10}" for p in _PHASES)
+        line += f" {asset_size / 1024 / 1024 / medians['install'] * 1000:>8.1f}"
+        print(line)
+
+    print()
+    print(f"{'type':>7} {'plugins':>8} {'install':>10} {'MB/s':>8}")
+    for kind in ("tar.gz", "tar.xz", "zip", "gz", "raw"):
+        group = [(size, m["install"]) for _, k, size, m in rows if k == kind]
+        if not group:
+            continue
+        install = statistics.median(t for _, t in group)
+        throughput = (
+            sum(s for s, _ in group) / sum(t for _, t in group) / 1024 / 1024 * 1000
+        )
+        print(f"{kind:>7} {len(group):>8} {_ms(install):>10} {throughput:>8.1f}")
+
+    print()
+    print(
+        "requests: " + ", ".join(f"{k}={v}" for k, v in sorted(fake.requests.items()))
+    )
+    print(f"asset bytes sent: {fake.bytes_sent / 1024 / 1024:.1f}MB")
+    fake.stop()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+import gzip
+import hashlib
+import io
+import json
+import random
+import sys
+import tarfile
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+from lib.lib import (
+    GITHUB_CHECKER_FLAG,
+    Plugin,
+    format_template,
+    get_format_kwargs,
+    get_plugin,
+    list_plugins,
+)
+
+VERSION = "1.2.3"
+_OLD_RELEASES = 150
+_PER_PAGE_DEFAULT = 30
+
+
+def supported(plugin: Plugin) -> tuple[bool, str]:
+    format_kwargs = get_format_kwargs(plugin, VERSION)
+    if format_kwargs["filename"].startswith("https"):
+        return False, "downloads from a non-GitHub host"
+    if plugin.custom_checker:
+        return False, "needs a real signature"
+    return True, ""
+
+
+def archive_type(plugin: Plugin, filename: str) -> str:
+    if not plugin.is_compressed:
+        return "raw"
+    for suffix in ("tar.gz", "tar.xz", "zip", "gz"):
+        if filename.endswith(f".{suffix}"):
+            return suffix
+    raise Exception(f"Unknown archive type: {filename}")
+
+
+def payload(size: int, seed: str) -> bytes:
+    # half random, half zeros per 4KiB block, roughly as compressible as a binary
+    rng = random.Random(seed)
+    block = 4096
+    chunks = [
+        rng.randbytes(block // 2) + bytes(block // 2) for _ in range(size // block + 1)
+    ]
+    return b"".join(chunks)[:size]
+
+
+def _member_paths(plugin: Plugin, bin_path: str, members: str | None) -> list[str]:
+    # where each plugin's default or custom copy looks for the binary
+    paths = [bin_path]
+    if plugin.custom_copy:
+        paths += [f"{members or ''}bin/{plugin.cmd}", plugin.cmd]
+    return list(dict.fromkeys(paths))
+
+
+def _archive(kind: str, paths: list[str], data: bytes) -> bytes:
+    buffer = io.BytesIO()
+    if kind in ("tar.gz", "tar.xz"):
+        with tarfile.open(fileobj=buffer, mode=f"w:{kind.split('.')[1]}") as tar:
+            for path in paths:
+                info = tarfile.TarInfo(path)
+                info.size = len(data)
+                info.mode = 0o755
+                tar.addfile(info, io.BytesIO(data))
+    elif kind == "zip":
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zf:
+            for path in paths:
+                zf.writestr(path, data)
+    elif kind == "gz":
+        return gzip.compress(data, mtime=0)
+    else:
+        return data
+    return buffer.getvalue()
+
+
+class Release:
+    def __init__(self, plugin: Plugin, size: int):
+        format_kwargs = get_format_kwargs(plugin, VERSION)
+        filename = format_kwargs["filename"]
+        checksum_filename = format_kwargs["checksum_filename"]
+        bin_path = format_template(plugin.bin_path, format_kwargs)
+        if plugin.extract_members:
+            members = format_template(plugin.extract_members, format_kwargs)
+        else:
+            members = None
+
+        self.plugin = plugin
+        self.tag = format_kwargs["version"]
+        self.kind = archive_type(plugin, filename)
+        data = payload(size, plugin.name)
+        self.assets = {
+            filename: _archive(
+                self.kind, _member_paths(plugin, bin_path, members), data
+            )
+        }
+
+        if checksum_filename and checksum_filename != GITHUB_CHECKER_FLAG:
+            # extract-stage checksums cover the binary, the rest cover the asset
+            checked_name, checked = (
+                (Path(bin_path).name, data)
+                if plugin.checksum_stage == "extract"
+                else (filename, self.assets[filename])
+            )
+            line = f"{hashlib.sha256(checked).hexdigest()}  {checked_name}\n"
+            self.assets[checksum_filename] = line.encode()
+
+    def json(self, base_url: str) -> dict:
+        return {
+            "id": 10_000,
+            "tag_name": self.tag,
+            "prerelease": False,
+            "published_at": "2024-06-01T00:00:00Z",
+            "assets": [
+                {
+                    "name": name,
+                    "size": len(data),
+                    "digest": f"sha256:{hashlib.sha256(data).hexdigest()}",
+                    "browser_download_url": (
+                        f"{base_url}/{self.plugin.repo_name}"
+                        f"/releases/download/{self.tag}/{name}"
+                    ),
+                }
+                for name, data in self.assets.items()
+            ],
+        }
+
+
+def _old_releases(plugin: Plugin, count: int) -> list[dict]:
+    tag = plugin.recover_raw_version("0.0.0")
+    prefix = tag[: tag.index("0.0.0")]
+    return [
+        {
+            "id": 10_000 - i,
+            "tag_name": f"{prefix}0.{i // 10}.{i % 10}",
+            "prerelease": False,
+            "published_at": f"2020-01-01T00:00:{i % 60:02d}Z",
+            "assets": [],
+        }
+        for i in range(count, 0, -1)
+    ]
+
+
+class FakeGitHub:
+    def __init__(
+        self,
+        plugins: list[Plugin],
+        size: int,
+        port: int = 0,
+        old_releases: int = _OLD_RELEASES,
+        drop_after: float = 0.0,
+        throttle: float = 0.0,
+        rate_limit: int = 0,
+        secondary_limit: int = 0,
+    ):
+        self.releases = {plugin.repo_name: Release(plugin, size) for plugin in plugins}
+        self.old_releases = {
+            plugin.repo_name: _old_releases(plugin, old_releases) for plugin in plugins
+        }
+        self.requests: dict[str, int] = {}
+        self.bytes_sent = 0
+        # cut full (non-ranged) asset downloads after this fraction, 0 disables
+        self.drop_after = drop_after
+        # per-connection bytes/s for asset bodies, like a CDN shaping each stream
+        self.throttle = throttle
+        # API requests allowed per window like X-RateLimit-*, 0 disables;
+        # the first secondary_limit API requests get a 429 with Retry-After
+        self.rate_limit = rate_limit
+        self.rate_remaining = rate_limit
+        self.rate_reset = int(time.time()) + 3600
+        self.secondary_limit = secondary_limit
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def count(self, kind: str):
+        with self._lock:
+            self.requests[kind] = self.requests.get(kind, 0) + 1
+
+    def charge(self):
+        with self._lock:
+            self.rate_remaining = max(0, self.rate_remaining - 1)
+
+    def sent(self, size: int):
+        with self._lock:
+            self.bytes_sent += size
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                path, _, query = self.path.partition("?")
+                params = dict(p.split("=", 1) for p in query.split("&") if "=" in p)
+                if path.startswith("/api/repos/"):
+                    self._api(path.removeprefix("/api/repos/"), params)
+                elif "/releases/download/" in path:
+                    self._download(path.lstrip("/"))
+                else:
+                    self._send(404, b"not found")
+
+            def _api(self, path: str, params: dict[str, str]):
+                if self.headers.get("Authorization"):
+                    fake.count("api_auth")
+                if fake.secondary_limit:
+                    with fake._lock:
+                        fake.secondary_limit -= 1
+                    fake.count("api_429")
+                    body = b'{"message": "You have exceeded a secondary rate limit"}'
+                    return self._send(429, body, {"Retry-After": "1"})
+                if fake.rate_limit:
+                    if fake.rate_remaining == 0:
+                        fake.count("api_403")
+                        return self._send(
+                            403, b'{"message": "API rate limit exceeded"}'
+                        )
+                    fake.charge()
+                owner, repo, _, rest = (path.split("/", 3) + [""])[:4]
+                release = fake.releases.get(f"{owner}/{repo}")
+                if not release:
+                    return self._send(404, b"not found")
+                if rest.startswith("tags/"):
+                    fake.count("api_tag")
+                    if rest.removeprefix("tags/") != release.tag:
+                        return self._send(404, b"not found")
+                    return self._json(release.json(fake.url))
+
+                fake.count("api_releases")
+                releases = [
+                    release.json(fake.url),
+                    *fake.old_releases[release.plugin.repo_name],
+                ]
+                per_page = int(params.get("per_page", _PER_PAGE_DEFAULT))
+                page = int(params.get("page", 1))
+                body = json.dumps(
+                    releases[(page - 1) * per_page : page * per_page]
+                ).encode()
+                etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+                headers = {"ETag": etag}
+                if page * per_page < len(releases):
+                    next_url = (
+                        f"{fake.url}/api/repos/{owner}/{repo}/releases"
+                        f"?per_page={per_page}&page={page + 1}"
+                    )
+                    headers["Link"] = f'<{next_url}>; rel="next"'
+                if self.headers.get("If-None-Match") == etag:
+                    return self._send(304, b"", headers)
+                self._send(200, body, {"Content-Type": "application/json", **headers})
+
+            def _download(self, path: str):
+                repo_name, rest = path.split("/releases/download/", 1)
+                tag, name = rest.rsplit("/", 1)
+                release = fake.releases.get(repo_name)
+                if not release or tag != release.tag or name not in release.assets:
+                    return self._send(404, b"not found")
+                data = release.assets[name]
+                etag = f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+                headers = {
+                    "Content-Type": "application/octet-stream",
+                    "Accept-Ranges": "bytes",
+                    "ETag": etag,
+                    "Last-Modified": "Sat, 01 Jun 2024 00:00:00 GMT",
+                }
+
+                byte_range = self.headers.get("Range", "")
+                if_range = self.headers.get("If-Range")
+                if byte_range.startswith("bytes=") and if_range in (None, etag):
+                    first, _, last = byte_range.removeprefix("bytes=").partition("-")
+                    start = int(first)
+                    end = min(int(last) if last else len(data) - 1, len(data) - 1)
+                    if start >= len(data):
+                        fake.count("download_416")
+                        return self._send(
+                            416, b"", {"Content-Range": f"bytes */{len(data)}"}
+                        )
+                    fake.count("download_range")
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                    return self._send(206, data[start : end + 1], headers, asset=True)
+
+                if fake.drop_after and len(data) > 1024:
+                    # promise the whole asset, send part of it and hang up
+                    cut = int(len(data) * fake.drop_after)
+                    fake.count("download_dropped")
+                    self.send_response(200)
+                    for key, value in headers.items():
+                        self.send_header(key, value)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self._write_body(data[:cut], asset=True)
+                    self.close_connection = True
+                    return
+                fake.count("download")
+                self._send(200, data, headers, asset=True)
+
+            def _json(self, data):
+                self._send(
+                    200, json.dumps(data).encode(), {"Content-Type": "application/json"}
+                )
+
+            def handle(self):
+                # clients hang up on purpose, e.g. after the first range of a
+                # ranged download
+                try:
+                    super().handle()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _send(
+                self,
+                status: int,
+                body: bytes,
+                headers: dict[str, str] | None = None,
+                asset: bool = False,
+            ):
+                self.send_response(status)
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                if fake.rate_limit and self.path.startswith("/api/"):
+                    self.send_header("X-RateLimit-Limit", str(fake.rate_limit))
+                    self.send_header("X-RateLimit-Remaining", str(fake.rate_remaining))
+                    self.send_header("X-RateLimit-Reset", str(fake.rate_reset))
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self._write_body(body, asset)
+
+            def _write_body(self, body: bytes, asset: bool = False):
+                step = 64 * 1024
+                start = time.perf_counter()
+                for offset in range(0, len(body), step):
+                    chunk = body[offset : offset + step]
+                    self.wfile.write(chunk)
+                    if asset:
+                        fake.sent(len(chunk))
+                    if not fake.throttle:
+                        continue
+                    delay = (offset + step) / fake.throttle - (
+                        time.perf_counter() - start
+                    )
+                    if delay > 0:
+                        time.sleep(delay)
+
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def all_plugins() -> list[Plugin]:
+    return [get_plugin(line.split("\t")[0]) for line in list_plugins().splitlines()]
+
+
+def main():
+    # python bench/fake_github.py [SIZE_MB] [PORT]
+    # then point lib.py at it with the printed MISE_ANIAAN_*_URL variables
+    size = (
+        int(float(sys.argv[1]) * 1024 * 1024) if len(sys.argv) > 1 else 4 * 1024 * 1024
+    )
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    plugins = [plugin for plugin in all_plugins() if supported(plugin)[0]]
+    fake = FakeGitHub(plugins, size, port=port)
+    print(f"export MISE_ANIAAN_API_URL={fake.url}/api")
+    print(f"export MISE_ANIAAN_GITHUB_URL={fake.url}")
+    print(f"serving {len(plugins)} plugins at version {VERSION}", file=sys.stderr)
+    try:
+        fake._server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
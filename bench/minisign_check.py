@@ -0,0 +1,170 @@
+import hashlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+from lib.lib import ed25519_verify, verify_minisign
+
+# python bench/minisign_check.py
+# checks the in-process Ed25519/minisign verifier against known-good signatures;
+# exits non-zero on the first wrong answer
+
+# RFC 8032 section 7.1, tests 1-3: public key, message, signature
+_RFC8032_VECTORS = [
+    (
+        "d75a980182b10ab7d54bfed3c964073a0ee172f3daa62325af021a68f707511a",
+        "",
+        "e5564300c360ac729086e2cc806e828a84877f1eb8e5d974d873e06522490155"
+        "5fb8821590a33bacc61e39701cf9b46bd25bf5f0595bbe24655141438e7a100b",
+    ),
+    (
+        "3d4017c3e843895a92b70aa74d1b7ebc9c982ccf2ec4968cc0cd55f12af4660c",
+        "72",
+        "92a009a9f0d4cab8720e820b5f642540a2b27b5416503f8fb3762223ebdb69da"
+        "085ac1e43e15996e458f3613d0f11d8c387b2eaeb4302aeeb00d291612bb0c00",
+    ),
+    (
+        "fc51cd8e6218a1a38da47ed00230f0580816ed13ba3303ac5deb911548908025",
+        "af82",
+        "6291d657deec24024827e69c3abe01a30ce548a284743a445e3680d7db5ac3ac"
+        "18ff9b538d16f290ae67f760984dc6594a7c15e9716ed28dc027beceea1ec40a",
+    ),
+]
+
+# signed with openssl pkeyutl from seed bytes(range(32)) and key id 0123456789abcdef,
+# over _payload(); the ED signature covers BLAKE2b-512 of it
+_PUBLIC_KEY = "RWQBI0VniavN7wOhB7/zzhC+HXDdGOdLwJln5NYwm6UNXx3chmQSVTG4"
+_MINISIGS = {
+    "Ed": (
+        "RWQBI0VniavN717pbPRmuxVNeK1UR+ENOboax2HpP/ZZL73yha"
+        "OdIvEw0F+DeleqlAWM9v9TPTM6yVS7FAve+lmjc/cfvS41XQg=",
+        "timestamp:1700000000\tfile:tool.tar.gz\tlegacy",
+        "46OSqsEaC5jML1Fh5VhcuHifWhXAxeV4pTEBRzR+elVh"
+        "dZhgVGzxH8AJfMnSEYEPP7nzmJphe04OY8zGs36LBQ==",
+    ),
+    "ED": (
+        "RUQBI0VniavN75CQRcY9Jt2I5veXzcdRtgzACnQVO/sZVdOnnJ"
+        "TwS8KZXIrT5Q+pO5pggYZlBRHiaHGUOZZFkJtgxFkqrF723wk=",
+        "timestamp:1700000000\tfile:tool.tar.gz\thashed",
+        "5iW9h01zq+Z/f/1olrW81TNcmn2hAwg0DQ8t4aE0lWRg"
+        "/MNpVAG/+od0B7KDLOBvhEYhr38iAOH8btWe0E3tBA==",
+    ),
+}
+# a key with the same Ed25519 key but another key id
+_OTHER_KEY_ID = "RWT+3LqYdlQyEAOhB7/zzhC+HXDdGOdLwJln5NYwm6UNXx3chmQSVTG4"
+
+
+def _payload() -> bytes:
+    return b"".join(hashlib.sha256(str(i).encode()).digest() for i in range(40000))
+
+
+def _minisig(signature: str, trusted_comment: str, global_signature: str) -> str:
+    return (
+        "untrusted comment: signature from minisign secret key\n"
+        f"{signature}\ntrusted comment: {trusted_comment}\n{global_signature}\n"
+    )
+
+
+def _expect(name: str, ok: bool):
+    print(f"{'ok' if ok else 'FAIL':>4}  {name}")
+    if not ok:
+        sys.exit(1)
+
+
+def _rejects(
+    public_key: str, file_path: Path, signature_path: Path, reason: str
+) -> bool:
+    try:
+        verify_minisign(public_key, file_path, signature_path)
+    except Exception as e:
+        return reason in str(e)
+    return False
+
+
+def main():
+    for i, (public_key, message, signature) in enumerate(_RFC8032_VECTORS, 1):
+        pk, msg, sig = (
+            bytes.fromhex(public_key),
+            bytes.fromhex(message),
+            bytes.fromhex(signature),
+        )
+        _expect(f"RFC 8032 test {i}", ed25519_verify(pk, sig, [msg]))
+        _expect(
+            f"RFC 8032 test {i}, altered message",
+            not ed25519_verify(pk, sig, [msg + b"x"]),
+        )
+        tampered = sig[:10] + bytes([sig[10] ^ 1]) + sig[11:]
+        _expect(
+            f"RFC 8032 test {i}, altered signature",
+            not ed25519_verify(pk, tampered, [msg]),
+        )
+
+    payload = _payload()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = Path(tmp_dir) / "tool.tar.gz"
+        signature_path = Path(tmp_dir) / "tool.tar.gz.minisig"
+        for algorithm, (
+            signature,
+            trusted_comment,
+            global_signature,
+        ) in _MINISIGS.items():
+            file_path.write_bytes(payload)
+            signature_path.write_text(
+                _minisig(signature, trusted_comment, global_signature)
+            )
+            start = time.perf_counter()
+            verified = (
+                verify_minisign(_PUBLIC_KEY, file_path, signature_path)
+                == trusted_comment
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            _expect(
+                f"{algorithm} minisig ({elapsed:.1f}ms for {len(payload) // 1024}KiB)",
+                verified,
+            )
+
+            file_path.write_bytes(payload[:-1] + bytes([payload[-1] ^ 1]))
+            _expect(
+                f"{algorithm} minisig, tampered file",
+                _rejects(
+                    _PUBLIC_KEY,
+                    file_path,
+                    signature_path,
+                    "signature verification failed",
+                ),
+            )
+            file_path.write_bytes(payload)
+
+            signature_path.write_text(
+                _minisig(
+                    signature, trusted_comment.replace("tool", "evil"), global_signature
+                )
+            )
+            _expect(
+                f"{algorithm} minisig, tampered trusted comment",
+                _rejects(
+                    _PUBLIC_KEY,
+                    file_path,
+                    signature_path,
+                    "trusted comment verification failed",
+                ),
+            )
+
+            signature_path.write_text(
+                _minisig(signature, trusted_comment, global_signature)
+            )
+            _expect(
+                f"{algorithm} minisig, other key id",
+                _rejects(
+                    _OTHER_KEY_ID, file_path, signature_path, "was signed with key"
+                ),
+            )
+
+
+if __name__ == "__main__":
+    main()
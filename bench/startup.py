@@ -0,0 +1,87 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+parent_dir = Path(__file__).parent.parent
+
+_RUNS = 10
+# budget for modules imported by the entry point on top of the bare interpreter
+_BUDGET_MS = 75.0
+# measure what users get, with bytecode caches written and reused
+_ENV = {k: v for k, v in os.environ.items() if k != "PYTHONDONTWRITEBYTECODE"}
+
+
+def _import_time_ms(stderr: str) -> float:
+    # only top-level entries, their cumulative column already covers nested imports
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if not cumulative.strip().isdigit() or name[1:].startswith(" "):
+            continue
+        total += int(cumulative)
+    return total / 1000
+
+
+def _measure(argv: list[str]) -> tuple[float, float]:
+    wall, imports = [], []
+    for _ in range(_RUNS):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", *argv],
+            capture_output=True,
+            text=True,
+            env=_ENV,
+        )
+        wall.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            raise Exception(f"{' '.join(argv)} failed: {result.stderr[-500:]}")
+        imports.append(_import_time_ms(result.stderr))
+    return statistics.median(wall), statistics.median(imports)
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else _BUDGET_MS
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle = Path(tmp_dir) / "mise-aniaan.pyz"
+        subprocess.run(
+            [sys.executable, str(parent_dir / "lib" / "lib.py"), "bundle", str(bundle)],
+            check=True,
+            capture_output=True,
+        )
+
+        entries = {
+            "bare interpreter": ["-c", "pass"],
+            "lib/lib.py": [str(parent_dir / "lib" / "lib.py"), "list-plugins"],
+            "lib/": [str(parent_dir / "lib"), "list-plugins"],
+            "bundle": [str(bundle), "list-plugins"],
+        }
+
+        # warm the plugin index and bytecode caches first
+        for argv in entries.values():
+            subprocess.run([sys.executable, *argv], capture_output=True, env=_ENV)
+
+        results = {name: _measure(argv) for name, argv in entries.items()}
+
+    _, baseline = results["bare interpreter"]
+    print(f"{'entry':>18} {'wall':>10} {'imports':>10} {'over bare':>10}")
+    failed = False
+    for name, (wall, imports) in results.items():
+        over = imports - baseline
+        print(f"{name:>18} {wall:>8.1f}ms {imports:>8.1f}ms {over:>8.1f}ms")
+        if name != "bare interpreter" and over > budget:
+            failed = True
+
+    if failed:
+        print(f"startup import budget of {budget:.1f}ms exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,17 +3,9 @@ function PLUGIN:BackendInstall(ctx)
   local version = ctx.version
   local install_path = ctx.install_path
 
-  local cmd = require("cmd")
+  local cli = require("cli")
 
-  local install_cmd = "python3 "
-    .. RUNTIME.pluginDirPath
-    .. "/lib/lib.py install "
-    .. tool
-    .. " "
-    .. version
-    .. " "
-    .. install_path
-  local _ = cmd.exec(install_cmd)
+  local _ = cli.exec({ "install", tool, version, install_path })
 
   return {}
 end
@@ -10,11 +10,10 @@ function PLUGIN:BackendListVersions(ctx)
     return tool_cache.versions
   end
 
-  local cmd = require("cmd")
+  local cli = require("cli")
   local json = require("json")
 
-  local list_cmd = "python3 " .. RUNTIME.pluginDirPath .. "/lib/lib.py list " .. tool
-  local result = cmd.exec(list_cmd)
+  local result = cli.exec({ "list", tool })
   local versions = json.decode(result)
 
   cache[tool] = {
@@ -0,0 +1,142 @@
+local cmd = require("cmd")
+local json = require("json")
+
+local M = {}
+
+-- prefer a prebuilt `lib.py bundle` next to the plugin, then the lib package so
+-- python can reuse cached bytecode for lib.lib
+function M.entry()
+  local bundle = RUNTIME.pluginDirPath .. "/mise-aniaan.pyz"
+  local f = io.open(bundle, "r")
+  if f then
+    f:close()
+    return bundle
+  end
+  return RUNTIME.pluginDirPath .. "/lib"
+end
+
+-- keep in sync with CACHE_DIR / daemon_socket_path() in lib/lib.py
+function M.socket_path()
+  local socket = os.getenv("MISE_ANIAAN_SOCKET")
+  if socket and socket ~= "" then
+    return socket
+  end
+  local cache_dir = os.getenv("MISE_ANIAAN_CACHE_DIR")
+  if not cache_dir or cache_dir == "" then
+    local base = os.getenv("XDG_CACHE_HOME")
+    if not base or base == "" then
+      base = os.getenv("HOME") .. "/.cache"
+    end
+    cache_dir = base .. "/mise-aniaan"
+  end
+  return cache_dir .. "/daemon.sock"
+end
+
+local function quote(arg)
+  return "'" .. string.gsub(arg, "'", "'\\''") .. "'"
+end
+
+local function command_line(argv)
+  local quoted = {}
+  for i, arg in ipairs(argv) do
+    quoted[i] = quote(arg)
+  end
+  return table.concat(quoted, " ")
+end
+
+-- a daemon keeps the environment it was started with, so callers send theirs and
+-- are turned away when it differs. keep in sync with _DAEMON_ENV in lib/lib.py
+local daemon_env = {
+  "GITHUB_TOKEN",
+  "GH_TOKEN",
+  "MISE_ANIAAN_GITHUB_TOKEN",
+  "MISE_ANIAAN_API_URL",
+  "MISE_ANIAAN_GITHUB_URL",
+  "MISE_ANIAAN_ARTIFACT_CACHE",
+  "MISE_ANIAAN_STREAM",
+  "MISE_ANIAAN_LIST_LIMIT",
+  "MISE_ANIAAN_MAX_RELEASE_PAGES",
+  "MISE_ANIAAN_TRACE",
+  "MISE_ANIAAN_DECOMPRESS",
+  "MISE_ANIAAN_CONNECTIONS",
+  "MISE_ANIAAN_HELPER_DIR",
+  "MISE_ANIAAN_MINISIGN",
+  "MISE_ANIAAN_DEDUP",
+  "http_proxy",
+  "https_proxy",
+  "no_proxy",
+  "HTTP_PROXY",
+  "HTTPS_PROXY",
+  "NO_PROXY",
+}
+
+local function request_env()
+  local env = {}
+  for _, key in ipairs(daemon_env) do
+    local value = os.getenv(key)
+    if value and value ~= "" then
+      env[key] = value
+    end
+  end
+  return env
+end
+
+-- hooks reach the daemon through `nc -U`; many images have no nc, and busybox and
+-- netcat-traditional have no -U (their -h never mentions unix sockets). checked once,
+-- without a usable client the daemon is neither asked nor spawned
+local has_client
+local function socket_client()
+  if has_client == nil then
+    local probe = "command -v nc >/dev/null 2>&1 && nc -h 2>&1 | grep -qi unix && echo nc"
+    local ok, found = pcall(cmd.exec, probe)
+    has_client = ok and found ~= nil and string.find(found, "nc", 1, true) ~= nil
+  end
+  return has_client
+end
+
+-- returns the output, or nil and a reason: "no-client" when there is no usable nc,
+-- "unreachable" when nothing listens on the socket, "mismatch" when the daemon was
+-- started with a different environment, or with older code (that daemon then exits)
+function M.request(argv)
+  if not socket_client() then
+    return nil, "no-client"
+  end
+  local socket = quote(M.socket_path())
+  local payload = quote(json.encode({ argv = argv, env = request_env() }))
+  -- io.open cannot open a unix socket, test -S checks it exists and nc connects
+  local command = "test -S " .. socket .. " && printf '%s\\n' " .. payload .. " | nc -U " .. socket .. " 2>/dev/null"
+  local ok, raw = pcall(cmd.exec, command)
+  if not ok or not raw or raw == "" then
+    return nil, "unreachable"
+  end
+
+  local response = json.decode(raw)
+  if response.env_mismatch or response.code_mismatch then
+    return nil, "mismatch"
+  end
+  if not response.ok then
+    error(response.error or response.output)
+  end
+  return response.output
+end
+
+function M.spawn()
+  local _ = pcall(cmd.exec, "nohup python3 " .. quote(M.entry()) .. " serve >/dev/null 2>&1 &")
+end
+
+-- talk to a resident `lib.py serve` when one is listening, otherwise start one for the
+-- next call (only if it could be reached) and run this one through the one-shot CLI
+function M.exec(argv)
+  if os.getenv("MISE_ANIAAN_DAEMON") ~= "0" then
+    local output, reason = M.request(argv)
+    if output then
+      return output
+    end
+    if reason == "unreachable" then
+      M.spawn()
+    end
+  end
+  return cmd.exec("python3 " .. quote(M.entry()) .. " " .. command_line(argv))
+end
+
+return M
@@ -1,19 +1,34 @@
-import gzip
+from __future__ import annotations
+
+import contextvars
+import io
 import json
+import marshal
 import os
-import platform
 import shutil
-import subprocess
 import sys
-import tarfile
-import tempfile
-import zipfile
-from dataclasses import dataclass
-from datetime import datetime
+import threading
+import time
+import types
+from contextlib import contextmanager
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Any, Callable, Literal, TypedDict, Union
-from urllib.error import URLError
-from urllib.request import Request, urlopen
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    BinaryIO,
+    Callable,
+    Iterable,
+    Iterator,
+    Literal,
+    TypedDict,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import ast
+    import http.client
+    import tarfile
 
 PlatformType = Literal["darwin", "linux"]
 ArchType = Literal["x86_64", "aarch64"]
@@ -32,15 +47,134 @@ class FormatKwargs(TypedDict):
 
 LibTemplate = Union[str, Callable[[FormatKwargs], str]]
 
+# opt-in timing trace: MISE_ANIAAN_TRACE=FILE or `--trace FILE` appends one JSON line
+# per finished span, "-" writes them to stderr
+_trace_target: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+    "trace_target", default=None
+)
+_current_span: contextvars.ContextVar[dict[str, Any] | None] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_trace_lock = threading.Lock()
 
-def verify_by_sha256sum(file_path: Path, expected: str):
-    print(f"Verifying checksum for {file_path.name}...")
-    if not shutil.which("shasum") and not shutil.which("sha256sum"):
-        raise Exception("shasum or sha256sum not found")
 
-    cmd = ["shasum", "-a", "256"] if shutil.which("shasum") else ["sha256sum"]
-    result = subprocess.run([*cmd, file_path], capture_output=True, text=True)
-    actual = result.stdout.split()[0]
+def _trace_destination() -> str | None:
+    return _trace_target.get() or os.environ.get("MISE_ANIAAN_TRACE") or None
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+    destination = _trace_destination()
+    if not destination:
+        yield attrs
+        return
+
+    parent = _current_span.get()
+    span_id = os.urandom(4).hex()
+    record = {
+        "span": name,
+        "trace": parent["trace"] if parent else span_id,
+        "id": span_id,
+        "parent": parent["id"] if parent else None,
+        "attrs": attrs,
+    }
+    token = _current_span.set(record)
+    started_at = time.time()
+    start = time.perf_counter()
+    try:
+        yield attrs
+    except BaseException as e:
+        attrs["error"] = str(e) or type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _current_span.reset(token)
+        del record["attrs"]
+        record.update(start=started_at, duration_ms=round(elapsed * 1000, 3), **attrs)
+        if attrs.get("bytes") and elapsed > 0:
+            record["mb_per_s"] = round(attrs["bytes"] / elapsed / 1024 / 1024, 2)
+        _emit_trace(destination, record)
+
+
+def _annotate(**attrs: Any):
+    # attach attributes to the innermost open span, a no-op when tracing is off
+    current = _current_span.get()
+    if current:
+        current["attrs"].update(attrs)
+
+
+def _emit_trace(destination: str, record: dict[str, Any]):
+    line = json.dumps(record, default=str) + "\n"
+    with _trace_lock:
+        if destination == "-":
+            sys.stderr.write(line)
+        else:
+            with open(destination, "a") as f:
+                f.write(line)
+
+
+_CHUNK_SIZE = 1024 * 1024
+
+# digests computed while downloading, keyed by path and validated by size/mtime
+_download_digests: dict[str, tuple[int, int, dict[str, str]]] = {}
+
+
+def _precomputed_digest(file_path: Path, algorithm: str) -> str | None:
+    entry = _download_digests.get(str(file_path))
+    if not entry:
+        return None
+    size, mtime_ns, digests = entry
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    if stat.st_size != size or stat.st_mtime_ns != mtime_ns:
+        return None
+    return digests.get(algorithm)
+
+
+_DIGEST_ALGORITHMS = ("sha256", "sha512", "blake2b")
+_DIGEST_HEX_LENGTHS = {64: "sha256", 128: "sha512"}
+
+
+def parse_digest(expected: str, algorithm: str | None = None) -> tuple[str, str]:
+    value = expected.strip().lower()
+    if ":" in value:
+        algorithm, value = value.split(":", 1)
+    if algorithm is None:
+        algorithm = _DIGEST_HEX_LENGTHS.get(len(value))
+    if algorithm not in _DIGEST_ALGORITHMS:
+        raise Exception(f"Unsupported digest: {expected}")
+    return algorithm, value
+
+
+def file_digest(file_path: Path, algorithm: str = "sha256") -> str:
+    import hashlib
+    import mmap
+
+    precomputed = _precomputed_digest(file_path, algorithm)
+    if precomputed is not None:
+        return precomputed
+
+    hasher = hashlib.new(algorithm)
+    with open(file_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        except (ValueError, OSError):
+            # empty files and some filesystems cannot be mapped
+            f.seek(0)
+            buffer = bytearray(_CHUNK_SIZE)
+            view = memoryview(buffer)
+            while size := f.readinto(buffer):
+                hasher.update(view[:size])
+    return hasher.hexdigest()
+
+
+def verify_digest(file_path: Path, expected: str, algorithm: str | None = None):
+    print(f"Verifying checksum for {file_path.name}...")
+    algorithm, expected = parse_digest(expected, algorithm)
+    actual = file_digest(file_path, algorithm)
 
     if actual != expected:
         raise Exception(
@@ -48,28 +182,37 @@ def verify_by_sha256sum(file_path: Path, expected: str):
         )
     print("Checksum verification passed")
 
-    pass
 
+def verify_by_sha256sum(file_path: Path, expected: str):
+    verify_digest(file_path=file_path, expected=expected, algorithm="sha256")
 
-def verify_by_sha256sum_with_checksum_path(file_path: Path, checksum_path: Path):
+
+def read_checksum_file(checksum_path: Path, filename: str) -> str:
     with open(checksum_path) as f:
         expected = None
         lines = f.readlines()
         for line in lines:
-            if file_path.name in line:
+            if filename in line:
                 expected = line.split()[0]
                 break
         if not expected and len(lines) == 1:
             expected = lines[0].split()[0]
         if not expected:
-            raise Exception(f"Checksum not found for {file_path.name}")
+            raise Exception(f"Checksum not found for {filename}")
 
-    verify_by_sha256sum(file_path=file_path, expected=expected)
+    return expected
+
+
+def verify_by_sha256sum_with_checksum_path(file_path: Path, checksum_path: Path):
+    expected = read_checksum_file(checksum_path, file_path.name)
+    verify_digest(file_path=file_path, expected=expected)
 
 
 def _verify_by_minisign(
     bin_path: str, public_key: str, file_path: Path, signature_path: Path
 ):
+    import subprocess
+
     cmd = [bin_path, "-P", public_key, "-x", signature_path, "-Vm", file_path]
     result = subprocess.run([*cmd, file_path], capture_output=True, text=True)
     if result.returncode != 0:
@@ -79,29 +222,259 @@ def _verify_by_minisign(
 _MINISIGN_VERSION = "0.11"
 _MINISIGN_CMD = "minisign"
 
+# Ed25519 signature verification (RFC 8032), enough for minisign without a binary
+_ED_P = 2**255 - 19
+_ED_L = 2**252 + 27742317777372353535851937790883648493
+_ED_D = -121665 * pow(121666, _ED_P - 2, _ED_P) % _ED_P
+_ED_SQRT_M1 = pow(2, (_ED_P - 1) // 4, _ED_P)
+
+
+def _ed_add(P: tuple[int, ...], Q: tuple[int, ...]) -> tuple[int, ...]:
+    p = _ED_P
+    a = (P[1] - P[0]) * (Q[1] - Q[0]) % p
+    b = (P[1] + P[0]) * (Q[1] + Q[0]) % p
+    c = 2 * P[3] * Q[3] * _ED_D % p
+    d = 2 * P[2] * Q[2] % p
+    e, f, g, h = b - a, d - c, d + c, b + a
+    return (e * f % p, g * h % p, f * g % p, e * h % p)
+
+
+def _ed_mul(scalar: int, P: tuple[int, ...]) -> tuple[int, ...]:
+    Q = (0, 1, 1, 0)
+    while scalar:
+        if scalar & 1:
+            Q = _ed_add(Q, P)
+        P = _ed_add(P, P)
+        scalar >>= 1
+    return Q
+
+
+def _ed_decompress(data: bytes) -> tuple[int, ...] | None:
+    p = _ED_P
+    y = int.from_bytes(data, "little")
+    sign = y >> 255
+    y &= (1 << 255) - 1
+    if y >= p:
+        return None
+    x2 = (y * y - 1) * pow(_ED_D * y * y + 1, p - 2, p) % p
+    if x2 == 0:
+        if sign:
+            return None
+        return (0, y, 1, 0)
+    x = pow(x2, (p + 3) // 8, p)
+    if (x * x - x2) % p:
+        x = x * _ED_SQRT_M1 % p
+    if (x * x - x2) % p:
+        return None
+    if x & 1 != sign:
+        x = p - x
+    return (x, y, 1, x * y % p)
+
+
+_ED_G = _ed_decompress((4 * pow(5, _ED_P - 2, _ED_P) % _ED_P).to_bytes(32, "little"))
+
+
+def ed25519_verify(
+    public_key: bytes, signature: bytes, message: Iterable[bytes]
+) -> bool:
+    # message is an iterable of chunks so large files can be streamed through SHA-512
+    import hashlib
+
+    if len(public_key) != 32 or len(signature) != 64:
+        return False
+    A = _ed_decompress(public_key)
+    R = _ed_decompress(signature[:32])
+    s = int.from_bytes(signature[32:], "little")
+    if A is None or R is None or s >= _ED_L:
+        return False
+
+    hasher = hashlib.sha512(signature[:32] + public_key)
+    for chunk in message:
+        hasher.update(chunk)
+    h = int.from_bytes(hasher.digest(), "little") % _ED_L
+
+    assert _ED_G is not None
+    sB = _ed_mul(s, _ED_G)
+    rhA = _ed_add(R, _ed_mul(h, A))
+    p = _ED_P
+    return (sB[0] * rhA[2] - rhA[0] * sB[2]) % p == 0 and (
+        sB[1] * rhA[2] - rhA[1] * sB[2]
+    ) % p == 0
+
+
+def _file_chunks(file_path: Path) -> Iterator[bytes]:
+    with open(file_path, "rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            yield chunk
+
+
+def _b64decode(value: str, size: int, what: str) -> bytes:
+    import base64
+    import binascii
+
+    try:
+        data = base64.b64decode(value.strip(), validate=True)
+    except binascii.Error:
+        data = b""
+    if len(data) != size:
+        raise Exception(f"minisign: malformed {what}")
+    return data
+
+
+def verify_minisign(public_key: str, file_path: Path, signature_path: Path) -> str:
+    # public key: "Ed" + key id (8) + Ed25519 key (32), base64
+    # signature file: untrusted comment, "Ed"/"ED" + key id + signature, trusted
+    # comment, and a global signature over signature + trusted comment
+    key = _b64decode(public_key.splitlines()[-1], 42, "public key")
+    lines = signature_path.read_text().splitlines()
+    if len(lines) < 4 or not lines[2].startswith("trusted comment: "):
+        raise Exception(f"minisign: malformed signature file {signature_path.name}")
+    sig = _b64decode(lines[1], 74, "signature")
+    trusted_comment = lines[2].removeprefix("trusted comment: ")
+    global_sig = _b64decode(lines[3], 64, "global signature")
+
+    if key[:2] != b"Ed":
+        raise Exception("minisign: unsupported public key algorithm")
+    if sig[2:10] != key[2:10]:
+        signed_with = sig[2:10][::-1].hex().upper()
+        raise Exception(
+            f"minisign: {signature_path.name} was signed with key {signed_with}, "
+            f"expected {key[2:10][::-1].hex().upper()}"
+        )
+
+    algorithm = sig[:2]
+    if algorithm == b"ED":
+        # prehashed: the signature covers BLAKE2b-512 of the file, usually
+        # computed while the file was downloading
+        message: Iterable[bytes] = [bytes.fromhex(file_digest(file_path, "blake2b"))]
+    elif algorithm == b"Ed":
+        message = _file_chunks(file_path)
+    else:
+        raise Exception(f"minisign: unsupported signature algorithm {algorithm!r}")
+
+    if not ed25519_verify(key[10:], sig[10:], message):
+        raise Exception(f"minisign: signature verification failed for {file_path.name}")
+    if not ed25519_verify(key[10:], global_sig, [sig[10:], trusted_comment.encode()]):
+        raise Exception(
+            f"minisign: trusted comment verification failed for {file_path.name}"
+        )
+    return trusted_comment
+
+
+def _minisign_backend() -> str:
+    # MISE_ANIAAN_MINISIGN=binary uses a minisign binary (PATH or helper cache)
+    return os.environ.get("MISE_ANIAAN_MINISIGN", "native")
+
 
 def verify_by_minisign(
     public_key: str, file_path: Path, signature_path: Path, format_kwargs: FormatKwargs
 ):
     print(f"minisign: Verifying signature for {file_path.name}...")
+    if _minisign_backend() != "binary":
+        trusted_comment = verify_minisign(public_key, file_path, signature_path)
+        print(
+            f"minisign: verification passed {file_path.name}, "
+            f"trusted comment: {trusted_comment}"
+        )
+        return
+
     if shutil.which(_MINISIGN_CMD):
         _verify_by_minisign(_MINISIGN_CMD, public_key, file_path, signature_path)
         return
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        install_path = Path(tmpdir)
-        install_path.mkdir(exist_ok=True)
-
-        install_version(_MINISIGN_CMD, _MINISIGN_VERSION, install_path.as_posix())
-        bin_path = install_path / "bin" / _MINISIGN_CMD
-        _verify_by_minisign(bin_path.as_posix(), public_key, file_path, signature_path)
+    bin_path = helper_tool(_MINISIGN_CMD, _MINISIGN_VERSION)
+    _verify_by_minisign(bin_path.as_posix(), public_key, file_path, signature_path)
 
     print(f"minisign: verification passed {file_path.name}")
 
 
-publish_at_sort_version_key = lambda x: datetime.strptime(
-    x["published_at"], "%Y-%m-%dT%H:%M:%SZ"
-)
+# tools bootstrapped for our own use (minisign), installed once per pinned version:
+# <helper dir>/<name>/<version>/bin/<name> plus <version>.json with its sha256
+_helper_lock = threading.Lock()
+
+
+def _helper_dir() -> Path:
+    return Path(os.environ.get("MISE_ANIAAN_HELPER_DIR") or CACHE_DIR / "tools")
+
+
+def _helper_paths(name: str, version: str) -> tuple[Path, Path]:
+    root = _helper_dir() / name
+    return root / version / "bin" / name, root / f"{version}.json"
+
+
+def _cached_helper(name: str, version: str) -> Path | None:
+    bin_path, manifest_path = _helper_paths(name, version)
+    manifest = _read_json(manifest_path)
+    if not isinstance(manifest, dict) or not bin_path.exists():
+        return None
+    try:
+        actual = file_digest(bin_path, "sha256")
+    except OSError:
+        return None
+    if actual != manifest.get("sha256"):
+        print(
+            f"{name} {version}: cached helper failed its integrity check",
+            file=sys.stderr,
+        )
+        return None
+    return bin_path
+
+
+def seed_helper(name: str, version: str, source: Path) -> Path:
+    import tempfile
+
+    bin_path, manifest_path = _helper_paths(name, version)
+    version_dir = bin_path.parent.parent
+    version_dir.parent.mkdir(parents=True, exist_ok=True)
+
+    staging = Path(tempfile.mkdtemp(prefix=f".{version}-", dir=version_dir.parent))
+    try:
+        staging.chmod(0o755)
+        staged = staging / "bin" / name
+        staged.parent.mkdir()
+        _fast_copy(source, staged)
+        staged.chmod(0o755)
+        digest = file_digest(staged, "sha256")
+
+        manifest_path.unlink(missing_ok=True)
+        shutil.rmtree(version_dir, ignore_errors=True)
+        try:
+            os.rename(staging, version_dir)
+        except OSError:
+            # another process seeded it first, use theirs if it checks out
+            if _cached_helper(name, version):
+                return bin_path
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+    _write_json_atomic(
+        manifest_path, {"name": name, "version": version, "sha256": digest}
+    )
+    return bin_path
+
+
+_HELPER_VERSIONS = {_MINISIGN_CMD: _MINISIGN_VERSION}
+
+
+def helper_tool(name: str, version: str) -> Path:
+    import tempfile
+
+    with _helper_lock:
+        bin_path = _cached_helper(name, version)
+        if bin_path:
+            return bin_path
+
+        print(f"{name}: bootstrapping {version} into {_helper_dir()}")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            install_version(name, version, tmp_dir)
+            return seed_helper(name, version, Path(tmp_dir) / "bin" / name)
+
+
+def publish_at_sort_version_key(release: dict):
+    from datetime import datetime
+
+    return datetime.strptime(release["published_at"], "%Y-%m-%dT%H:%M:%SZ")
 
 
 @dataclass(kw_only=True)
@@ -118,6 +491,9 @@ class Plugin:
     recover_raw_version: Callable[[str], str] = lambda x: x
     normalize_version: Callable[[str], str] = lambda x: x.removeprefix("v")
     custom_copy: Callable[["Plugin", Path, Path, FormatKwargs], None] | None = None
+    # archive members to extract: a path, or a directory prefix ending in "/".
+    # defaults to bin_path for plugins without custom_copy, everything otherwise
+    extract_members: LibTemplate | None = None
     is_compressed: bool = True
     # list version filter
     release_filter: Callable[[dict], bool] = lambda _: True
@@ -125,30 +501,767 @@ class Plugin:
     sort_version_key: Callable[[dict], Any] = publish_at_sort_version_key
 
 
+_PLUGINS_DIR = Path(__file__).parent / "plugins"
+_PLUGIN_META_KEYS = ("name", "cmd", "repo_name")
+
+
+def _plugin_meta(tree: ast.Module) -> dict[str, str]:
+    # static fields of the `PLUGIN = Plugin(...)` call, read without running the module
+    import ast
+
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(isinstance(t, ast.Name) and t.id == "PLUGIN" for t in node.targets)
+            and isinstance(node.value, ast.Call)
+        ):
+            return {
+                keyword.arg: keyword.value.value
+                for keyword in node.value.keywords
+                if keyword.arg in _PLUGIN_META_KEYS
+                and isinstance(keyword.value, ast.Constant)
+            }
+    return {}
+
+
+def _ensure_lib_importable():
+    root = str(Path(__file__).parent.parent)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    # plugins import `lib.lib`; when run as a script that must resolve to this
+    # module rather than a second copy with its own state
+    if __name__ == "__main__":
+        sys.modules.setdefault("lib.lib", sys.modules[__name__])
+
+
+class _PluginRegistry:
+    def __init__(self, plugins_dir: Path):
+        self._plugins_dir = plugins_dir
+        self._entries: dict[str, dict] | None = None
+        self._plugins: dict[str, Plugin] = {}
+        self._lock = threading.RLock()
+
+    def _index_path(self) -> Path:
+        # next to the sources like their .pyc files: code loaded from here is
+        # exec'd, so it must not live in the (possibly shared) CACHE_DIR
+        return (
+            self._plugins_dir
+            / "__pycache__"
+            / f"index.{sys.implementation.cache_tag}.idx"
+        )
+
+    def _load_index(self) -> dict[str, dict]:
+        try:
+            index = marshal.loads(self._index_path().read_bytes())
+        except (OSError, ValueError, EOFError, TypeError):
+            return {}
+        if (
+            not isinstance(index, dict)
+            or index.get("tag") != sys.implementation.cache_tag
+        ):
+            return {}
+        return index.get("plugins", {})
+
+    def _load_frozen_index(self) -> dict[str, dict]:
+        index = _bundle_index()
+        if index is None:
+            raise Exception(f"Plugin directory not found: {self._plugins_dir}")
+        if index.get("tag") != sys.implementation.cache_tag:
+            raise Exception(
+                f"Bundle was built for {index.get('tag')}, "
+                f"not {sys.implementation.cache_tag}"
+            )
+        return index["plugins"]
+
+    def _scan(self) -> dict[str, dict]:
+        if not self._plugins_dir.is_dir():
+            return self._load_frozen_index()
+
+        cached = self._load_index()
+        entries: dict[str, dict] = {}
+        changed = False
+
+        for path in sorted(self._plugins_dir.glob("*.py")):
+            if path.name == "__init__.py":
+                continue
+            stat = path.stat()
+            entry = cached.get(path.stem)
+            if not entry or (entry["mtime_ns"], entry["size"]) != (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                import ast
+
+                source = path.read_bytes()
+                tree = ast.parse(source, filename=str(path))
+                entry = {
+                    "mtime_ns": stat.st_mtime_ns,
+                    "size": stat.st_size,
+                    "meta": _plugin_meta(tree),
+                    "code": compile(tree, str(path), "exec"),
+                }
+                changed = True
+            entries[path.stem] = entry
+
+        if changed or entries.keys() != cached.keys():
+            index = {"tag": sys.implementation.cache_tag, "plugins": entries}
+            # like .pyc files: skipped for read-only checkouts and -B
+            if not sys.dont_write_bytecode and os.access(self._plugins_dir, os.W_OK):
+                _write_bytes_atomic(self._index_path(), marshal.dumps(index))
+        return entries
+
+    def entries(self) -> dict[str, dict]:
+        with self._lock:
+            if self._entries is None:
+                self._entries = self._scan()
+            return self._entries
+
+    def names(self) -> list[str]:
+        return list(self.entries())
+
+    def meta(self, plugin_name: str) -> dict[str, str]:
+        return self.entries()[plugin_name]["meta"]
+
+    def get(self, plugin_name: str) -> Plugin:
+        with self._lock:
+            if plugin_name in self._plugins:
+                return self._plugins[plugin_name]
+
+            entry = self.entries().get(plugin_name)
+            if entry is None:
+                raise Exception(f"Plugin config not found: {plugin_name}")
+
+            _ensure_lib_importable()
+            module = types.ModuleType("plugin_config")
+            module.__file__ = str(self._plugins_dir / f"{plugin_name}.py")
+            exec(entry["code"], module.__dict__)
+
+            self._plugins[plugin_name] = module.PLUGIN
+            return module.PLUGIN
+
+
+_registry = _PluginRegistry(_PLUGINS_DIR)
+
+
 def get_plugin(plugin_name: str) -> Plugin:
-    plugin_config_path = Path(__file__).parent / "plugins" / f"{plugin_name}.py"
+    return _registry.get(plugin_name)
 
-    if not plugin_config_path.exists():
-        raise Exception(f"Plugin config not found: {plugin_name}")
 
-    import importlib.util
+def list_plugins() -> str:
+    lines = []
+    for plugin_name in _registry.names():
+        meta = _registry.meta(plugin_name)
+        lines.append(f"{plugin_name}\t{meta.get('repo_name', '')}")
+    return "\n".join(lines)
 
-    spec = importlib.util.spec_from_file_location("plugin_config", plugin_config_path)
-    module = importlib.util.module_from_spec(spec)  # type: ignore
-    spec.loader.exec_module(module)  # type: ignore
 
-    return module.PLUGIN
+def describe_plugin(plugin_name: str) -> str:
+    plugin = get_plugin(plugin_name)
+    description = {}
+    for field in fields(plugin):
+        value = getattr(plugin, field.name)
+        description[field.name] = "<function>" if callable(value) else value
+    return json.dumps(description, indent=2)
 
 
-API_RELEASE_URL = "https://api.github.com/repos/{repo_name}/releases"
+# overridable so the releases API and download host can be pointed at a mirror or
+# at bench/fake_github.py
+API_BASE_URL = os.environ.get("MISE_ANIAAN_API_URL", "https://api.github.com").rstrip(
+    "/"
+)
+GITHUB_BASE_URL = os.environ.get("MISE_ANIAAN_GITHUB_URL", "https://github.com").rstrip(
+    "/"
+)
+
+API_RELEASE_URL = API_BASE_URL + "/repos/{repo_name}/releases"
 API_TAG_INFO_URL = API_RELEASE_URL + "/tags/{version}"
-GITHUB_URL = "https://github.com/{repo_name}"
+GITHUB_URL = GITHUB_BASE_URL + "/{repo_name}"
 DOWNLOAD_BASE_URL = GITHUB_URL + "/releases/download/{version}"
 BINARY_URL = DOWNLOAD_BASE_URL + "/{filename}"
 CHECKSUM_URL = DOWNLOAD_BASE_URL + "/{checksum_filename}"
 
 GITHUB_CHECKER_FLAG = "github-api"
 
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+}
+
+_HTTP_TIMEOUT = 60
+_HTTP_MAX_REDIRECTS = 10
+_HTTP_MAX_IDLE_PER_HOST = 4
+_REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+
+class HttpError(Exception):
+    def __init__(self, url: str, status: int, reason: str = ""):
+        super().__init__(f"{url} status: {status} {reason}".rstrip())
+        self.url = url
+        self.status = status
+
+
+class RateLimitError(HttpError):
+    def __init__(self, url: str, status: int, reset: float | None):
+        when = time.strftime("%H:%M:%S", time.localtime(reset)) if reset else "later"
+        hint = (
+            "" if _api_token() else ", set GITHUB_TOKEN or GH_TOKEN for a higher limit"
+        )
+        super().__init__(
+            url, status, f"GitHub API rate limit exhausted until {when}{hint}"
+        )
+        self.reset = reset
+
+
+class _HttpClient:
+    def __init__(self):
+        self._idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+        # connection behind each response handed out by request(), by id()
+        self._active: dict[int, http.client.HTTPConnection] = {}
+        self._lock = threading.Lock()
+        self._proxies: dict[str, str] | None = None
+
+    def _proxy_for(self, scheme: str, host: str) -> str | None:
+        from urllib.request import getproxies, proxy_bypass
+
+        if self._proxies is None:
+            self._proxies = getproxies()
+        proxy = self._proxies.get(scheme)
+        if not proxy or proxy_bypass(host):
+            return None
+        return proxy
+
+    def _connect(self, scheme: str, host: str, port: int) -> http.client.HTTPConnection:
+        import http.client
+        from urllib.parse import urlsplit
+
+        proxy = self._proxy_for(scheme, host)
+        if proxy:
+            proxy_url = urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+            proxy_port = proxy_url.port or (443 if proxy_url.scheme == "https" else 80)
+            proxy_cls = (
+                http.client.HTTPSConnection
+                if proxy_url.scheme == "https"
+                else http.client.HTTPConnection
+            )
+            conn = proxy_cls(
+                proxy_url.hostname or "", proxy_port, timeout=_HTTP_TIMEOUT
+            )
+            if scheme == "https":
+                conn.set_tunnel(host, port)
+            return conn
+
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=_HTTP_TIMEOUT)
+        return http.client.HTTPConnection(host, port, timeout=_HTTP_TIMEOUT)
+
+    def _acquire(
+        self, key: tuple[str, str, int]
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._connect(*key), False
+
+    def _release(self, key: tuple[str, str, int], conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < _HTTP_MAX_IDLE_PER_HOST:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def _finish(
+        self,
+        key: tuple[str, str, int],
+        conn: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ):
+        if response.isclosed() and not response.will_close:
+            self._release(key, conn)
+        else:
+            conn.close()
+
+    def _send(
+        self, method: str, url: str, headers: dict[str, str]
+    ) -> tuple[
+        tuple[str, str, int], http.client.HTTPConnection, http.client.HTTPResponse
+    ]:
+        import http.client
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        scheme = parts.scheme
+        if scheme not in ("http", "https"):
+            raise Exception(f"Unsupported url: {url}")
+        key = (
+            scheme,
+            parts.hostname or "",
+            parts.port or (443 if scheme == "https" else 80),
+        )
+
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        if scheme == "http" and self._proxy_for(scheme, key[1]):
+            path = url
+
+        while True:
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, path, headers=headers)
+                return key, conn, conn.getresponse()
+            except (http.client.RemoteDisconnected, ConnectionError):
+                conn.close()
+                # the server dropped an idle keep-alive connection, retry on a fresh one
+                if not reused:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+
+    @contextmanager
+    def request(
+        self, url: str, headers: dict[str, str] | None = None, method: str = "GET"
+    ) -> Iterator[http.client.HTTPResponse]:
+        from urllib.parse import urljoin, urlsplit
+
+        headers = {**_HEADERS, **(headers or {})}
+        for _ in range(_HTTP_MAX_REDIRECTS + 1):
+            key, conn, response = self._send(method, url, headers)
+            location = response.getheader("Location")
+            if response.status not in _REDIRECT_STATUSES or not location:
+                break
+
+            response.read()
+            self._finish(key, conn, response)
+
+            next_url = urljoin(url, location)
+            if urlsplit(next_url).netloc != urlsplit(url).netloc:
+                headers = {
+                    k: v for k, v in headers.items() if k.lower() != "authorization"
+                }
+            if response.status == 303:
+                method = "GET"
+            url = next_url
+        else:
+            raise HttpError(url, response.status, "too many redirects")
+
+        with self._lock:
+            self._active[id(response)] = conn
+        try:
+            yield response
+        finally:
+            with self._lock:
+                self._active.pop(id(response), None)
+            self._finish(key, conn, response)
+
+    def abandon(self, response: http.client.HTTPResponse):
+        # stop reading a body part way: close the connection now so the server
+        # stops sending, instead of leaving it open until the request() block ends
+        with self._lock:
+            conn = self._active.get(id(response))
+        response.will_close = True
+        if conn:
+            conn.close()
+        response.close()
+
+
+_http = _HttpClient()
+
+
+def _check_status(
+    url: str, response: http.client.HTTPResponse | _ApiResponse, *ok: int
+):
+    if response.status not in (ok or (200,)):
+        response.read()
+        raise HttpError(url, response.status, response.reason)
+
+
+CACHE_DIR = Path(
+    os.environ.get("MISE_ANIAAN_CACHE_DIR")
+    or Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "mise-aniaan"
+)
+
+
+def _write_bytes_atomic(path: Path, data: bytes):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(
+            f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"cache: failed to write {path}: {e}", file=sys.stderr)
+
+
+def _write_json_atomic(path: Path, data: Any):
+    _write_bytes_atomic(path, json.dumps(data).encode())
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+_API_ATTEMPTS = 4
+_API_MAX_RETRY_AFTER = 60.0
+# requests kept back from release history pagination for installs (tag lookups)
+_API_RESERVE = 5
+
+
+def _api_token() -> str | None:
+    return (
+        os.environ.get("MISE_ANIAAN_GITHUB_TOKEN")
+        or os.environ.get("GITHUB_TOKEN")
+        or os.environ.get("GH_TOKEN")
+        or None
+    )
+
+
+@dataclass
+class _ApiResponse:
+    status: int
+    reason: str
+    headers: dict[str, str]
+    body: bytes
+
+    def read(self) -> bytes:
+        return self.body
+
+    def getheader(self, name: str, default: str | None = None) -> str | None:
+        return self.headers.get(name.lower(), default)
+
+
+class _GitHubApi:
+    # GitHub API requests: authenticated when a token is set, identical requests
+    # in flight are sent once, and the rate limit budget from the response
+    # headers is persisted so every process on the host backs off together
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: dict[tuple, tuple[threading.Event, list]] = {}
+
+    def _state_path(self) -> Path:
+        return CACHE_DIR / "ratelimit.json"
+
+    def _identity(self) -> str:
+        import hashlib
+
+        token = _api_token()
+        return hashlib.sha256(token.encode()).hexdigest()[:16] if token else "anonymous"
+
+    def _state(self) -> dict[str, Any]:
+        state = _read_json(self._state_path())
+        entry = state.get(self._identity()) if isinstance(state, dict) else None
+        if not isinstance(entry, dict) or entry.get("reset", 0) <= time.time():
+            return {}
+        return entry
+
+    def _record(self, response: _ApiResponse):
+        remaining = response.getheader("X-RateLimit-Remaining")
+        reset = response.getheader("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        with self._lock:
+            state = _read_json(self._state_path())
+            if not isinstance(state, dict):
+                state = {}
+            state[self._identity()] = {
+                "remaining": int(remaining),
+                "limit": int(response.getheader("X-RateLimit-Limit") or 0),
+                "reset": float(reset),
+            }
+            _write_json_atomic(self._state_path(), state)
+
+    def budget(self) -> int | None:
+        # requests left in the current window, None when not known yet
+        return self._state().get("remaining")
+
+    def get(self, url: str, headers: dict[str, str] | None = None) -> _ApiResponse:
+        key = (url, tuple(sorted((headers or {}).items())))
+        with self._lock:
+            waiter = self._inflight.get(key)
+            leader = waiter is None
+            if leader:
+                waiter = self._inflight[key] = (threading.Event(), [])
+        done, result = waiter  # type: ignore
+        if not leader:
+            done.wait()
+            if isinstance(result[0], BaseException):
+                raise result[0]
+            return result[0]
+
+        try:
+            result.append(self._get(url, headers or {}))
+        except BaseException as e:
+            result.append(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            done.set()
+        return result[0]
+
+    def _get(self, url: str, headers: dict[str, str]) -> _ApiResponse:
+        from urllib.parse import urlsplit
+
+        state = self._state()
+        if state.get("remaining") == 0:
+            raise RateLimitError(url, 403, state["reset"])
+
+        headers = {"Accept": "application/vnd.github+json", **headers}
+        token = _api_token()
+        if token and urlsplit(url).netloc == urlsplit(API_BASE_URL).netloc:
+            headers["Authorization"] = f"Bearer {token}"
+
+        attempt = 0
+        while True:
+            attempt += 1
+            with _http.request(url, headers=headers) as raw:
+                response = _ApiResponse(
+                    raw.status,
+                    raw.reason,
+                    {key.lower(): value for key, value in raw.getheaders()},
+                    raw.read(),
+                )
+            self._record(response)
+
+            if response.status not in (403, 429) and response.status < 500:
+                return response
+
+            retry_after = response.getheader("Retry-After")
+            reset = response.getheader("X-RateLimit-Reset")
+            if response.getheader("X-RateLimit-Remaining") == "0" and not retry_after:
+                # primary limit: nothing to gain from retrying before the reset
+                raise RateLimitError(
+                    url, response.status, float(reset) if reset else None
+                )
+            if (
+                response.status == 403
+                and not retry_after
+                and b"rate limit" not in response.body
+            ):
+                # a plain permission error
+                return response
+            # secondary limit or server error: honour Retry-After, else back off
+            delay = float(retry_after) if retry_after else 2.0 ** (attempt - 1)
+            if attempt == _API_ATTEMPTS or delay > _API_MAX_RETRY_AFTER:
+                if response.status >= 500:
+                    return response
+                raise RateLimitError(url, response.status, time.time() + delay)
+            print(
+                f"{url} returned {response.status}, retrying in {delay:g}s",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
+
+
+_api = _GitHubApi()
+
+
+def _release_cache_path(repo_name: str) -> Path:
+    return CACHE_DIR / "releases" / f"{repo_name.replace('/', '__')}.json"
+
+
+# tag -> asset name -> digest/size/url, rebuilt from every releases fetch so the
+# github-api checker does not need a tag API call per install
+def _asset_index_path(repo_name: str) -> Path:
+    return CACHE_DIR / "assets" / f"{repo_name.replace('/', '__')}.json"
+
+
+def _index_entries(release: dict) -> dict[str, dict]:
+    return {
+        asset["name"]: {
+            "digest": asset.get("digest"),
+            "size": asset.get("size"),
+            "url": asset.get("browser_download_url"),
+        }
+        for asset in release.get("assets", [])
+    }
+
+
+def _update_asset_index(repo_name: str, releases: list[dict], replace: bool = True):
+    index = {} if replace else _read_json(_asset_index_path(repo_name))
+    if not isinstance(index, dict):
+        index = {}
+    for release in releases:
+        index[release["tag_name"]] = _index_entries(release)
+    _write_json_atomic(_asset_index_path(repo_name), index)
+
+
+def _asset_index_lookup(repo_name: str, tag: str) -> dict[str, dict] | None:
+    index = _read_json(_asset_index_path(repo_name))
+    if not isinstance(index, dict):
+        return None
+    return index.get(tag)
+
+
+_RELEASES_PER_PAGE = 100
+_RELEASE_PAGE_WORKERS = 8
+_RELEASE_KEYS = ("id", "tag_name", "name", "published_at", "prerelease", "draft")
+_ASSET_KEYS = ("name", "digest", "size", "browser_download_url")
+
+
+def _max_release_pages() -> int:
+    # GitHub stops listing releases after 1000 entries anyway
+    return int(os.environ.get("MISE_ANIAAN_MAX_RELEASE_PAGES", "10"))
+
+
+def _trim_release(release: dict) -> dict:
+    trimmed = {key: release.get(key) for key in _RELEASE_KEYS}
+    trimmed["assets"] = [
+        {key: asset.get(key) for key in _ASSET_KEYS}
+        for asset in release.get("assets", [])
+    ]
+    return trimmed
+
+
+def _parse_link_header(value: str | None) -> dict[str, str]:
+    links = {}
+    for part in (value or "").split(","):
+        url, _, params = part.partition(";")
+        for param in params.split(";"):
+            key, _, rel = param.strip().partition("=")
+            if key == "rel":
+                links[rel.strip('"')] = url.strip().strip("<>")
+    return links
+
+
+def _page_url(url: str, page: int) -> str:
+    from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query["page"] = str(page)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _fetch_release_page(url: str) -> tuple[list[dict], dict[str, str]]:
+    response = _api.get(url)
+    _check_status(url, response)
+    releases = json.loads(response.read())
+    links = _parse_link_header(response.getheader("Link"))
+    return [_trim_release(release) for release in releases], links
+
+
+def fetch_releases(repo_name: str) -> list[dict]:
+    url = (
+        API_RELEASE_URL.format(repo_name=repo_name) + f"?per_page={_RELEASES_PER_PAGE}"
+    )
+    cached = _read_json(_release_cache_path(repo_name))
+    if not isinstance(cached, dict) or cached.get("url") != url:
+        cached = None
+
+    try:
+        return _fetch_releases(repo_name, url, cached)
+    except RateLimitError as e:
+        if not cached:
+            raise
+        # an old list beats no list, the next call after the reset refreshes it
+        print(f"{e}, using cached releases", file=sys.stderr)
+        _annotate(releases_cache="stale")
+        if not _asset_index_path(repo_name).exists():
+            _update_asset_index(repo_name, cached["releases"])
+        return cached["releases"]
+
+
+def _fetch_releases(repo_name: str, url: str, cached: dict | None) -> list[dict]:
+    from concurrent.futures import ThreadPoolExecutor
+    from urllib.parse import parse_qsl, urlsplit
+
+    headers = {}
+    if cached and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+    if cached and cached.get("last_modified"):
+        headers["If-Modified-Since"] = cached["last_modified"]
+
+    response = _api.get(url, headers=headers)
+    if response.status == 304 and cached:
+        _annotate(releases_cache="not-modified", pages=1)
+        if not _asset_index_path(repo_name).exists():
+            _update_asset_index(repo_name, cached["releases"])
+        return cached["releases"]
+    _check_status(url, response)
+    releases = [_trim_release(release) for release in json.loads(response.read())]
+    links = _parse_link_header(response.getheader("Link"))
+    etag = response.getheader("ETag")
+    last_modified = response.getheader("Last-Modified")
+
+    max_pages = _max_release_pages()
+    budget = _api.budget()
+    if budget is not None:
+        # leave a few requests for installs rather than walking deep history
+        max_pages = max(1, min(max_pages, budget - _API_RESERVE + 1))
+    known = {release["id"]: release for release in cached["releases"]} if cached else {}
+
+    if known:
+        # newest first: walk forward only until we reach releases we already have
+        page = 1
+        page_releases = releases
+        while (
+            "next" in links
+            and page < max_pages
+            and not any(release["id"] in known for release in page_releases)
+        ):
+            page_releases, links = _fetch_release_page(links["next"])
+            releases.extend(page_releases)
+            page += 1
+        _annotate(releases_cache="incremental", pages=page)
+    elif "last" in links:
+        last_page = int(dict(parse_qsl(urlsplit(links["last"]).query)).get("page", 1))
+        page_urls = [
+            _page_url(url, page) for page in range(2, min(last_page, max_pages) + 1)
+        ]
+        context = contextvars.copy_context()
+        with ThreadPoolExecutor(max_workers=_RELEASE_PAGE_WORKERS) as pool:
+            futures = [
+                pool.submit(context.copy().run, _fetch_release_page, page_url)
+                for page_url in page_urls
+            ]
+            for future in futures:
+                page_releases, _ = future.result()
+                releases.extend(page_releases)
+        _annotate(releases_cache="cold", pages=len(page_urls) + 1)
+    else:
+        _annotate(releases_cache="cold", pages=1)
+
+    if "next" not in links:
+        # walked to the end of the listing, releases missing from it were deleted
+        known = {}
+    elif releases:
+        # the fetched pages cover every release from their oldest id up, a newer
+        # cached one missing from them was deleted
+        fetched = {release["id"] for release in releases}
+        oldest = min(fetched)
+        known = {
+            release_id: release
+            for release_id, release in known.items()
+            if release_id < oldest or release_id in fetched
+        }
+    # a tag that was deleted and recreated (neovim nightly) comes back under a new
+    # id, the fetched pages and then the highest id win
+    by_tag: dict[str, dict] = {}
+    for release in [
+        *releases,
+        *sorted(known.values(), key=lambda r: r["id"], reverse=True),
+    ]:
+        by_tag.setdefault(release["tag_name"], release)
+    releases = list(by_tag.values())
+
+    _write_json_atomic(
+        _release_cache_path(repo_name),
+        {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "releases": releases,
+        },
+    )
+    _update_asset_index(repo_name, releases)
+    return releases
+
 
 def list_repo_url(plugin_name: str) -> str:
     plugin = get_plugin(plugin_name)
@@ -159,46 +1272,53 @@ def list_version(
     plugin_name: str,
     with_published_at: bool = False,
     output_format: Literal["json", "txt"] = "json",
+    limit: int | None = None,
 ) -> str:
-    plugin = get_plugin(plugin_name)
-    url = API_RELEASE_URL.format(repo_name=plugin.repo_name)
+    import http.client
 
-    try:
-        with urlopen(url) as response:
-            releases = json.loads(response.read())
-
-        sorted_releases = sorted(
-            filter(plugin.release_filter, releases),
-            key=plugin.sort_version_key,
-            reverse=True,
-        )
+    plugin = get_plugin(plugin_name)
+    if limit is None:
+        limit = int(os.environ.get("MISE_ANIAAN_LIST_LIMIT", "10"))
+
+    with span("list", plugin=plugin_name):
+        try:
+            releases = fetch_releases(plugin.repo_name)
+            _annotate(releases=len(releases))
+
+            sorted_releases = sorted(
+                filter(plugin.release_filter, releases),
+                key=plugin.sort_version_key,
+                reverse=True,
+            )
 
-        recent_versions = sorted_releases[:10]
+            recent_versions = sorted_releases[:limit] if limit > 0 else sorted_releases
 
-        if with_published_at:
-            versions = [
-                plugin.normalize_version(release["tag_name"])
-                + "#"
-                + release["published_at"]
-                for release in recent_versions
-            ]
-        else:
-            versions = [
-                plugin.normalize_version(release["tag_name"])
-                for release in recent_versions
-            ]
-        versions = list(reversed(versions))
+            if with_published_at:
+                versions = [
+                    plugin.normalize_version(release["tag_name"])
+                    + "#"
+                    + release["published_at"]
+                    for release in recent_versions
+                ]
+            else:
+                versions = [
+                    plugin.normalize_version(release["tag_name"])
+                    for release in recent_versions
+                ]
+            versions = list(reversed(versions))
 
-        if output_format == "json":
-            return json.dumps(versions)
-        else:
-            return "\n".join(versions)
+            if output_format == "json":
+                return json.dumps(versions)
+            else:
+                return "\n".join(versions)
 
-    except URLError as e:
-        raise Exception(f"get version failed: {str(e)}")
+        except (HttpError, OSError, http.client.HTTPException) as e:
+            raise Exception(f"get version failed: {str(e)}")
 
 
 def get_system_info() -> tuple[PlatformType, ArchType]:
+    import platform
+
     system = platform.system().lower()
     if system == "darwin":
         plat = "darwin"
@@ -228,64 +1348,864 @@ def format_template(template: LibTemplate, format_kwargs: FormatKwargs) -> str:
     return template.format(**format_kwargs)
 
 
-def extract(download_path: Path, extract_path: Path, bin_path: str):
+MemberSelector = Union[str, Callable[[str], bool], None]
+
+
+def _member_selector(members: MemberSelector) -> Callable[[str], bool] | None:
+    if members is None or callable(members):
+        return members
+    path = members.removeprefix("./")
+    if path.endswith("/"):
+        return lambda name: name.removeprefix("./").startswith(path)
+    return lambda name: name.removeprefix("./") == path
+
+
+# multi-threaded or at least out-of-process decoders, tried before the stdlib
+_DECOMPRESS_COMMANDS = {
+    "gz": ("pigz", "-dc"),
+    "xz": ("xz", "-T0", "-dc"),
+    "zst": ("zstd", "-dcq"),
+}
+_TAR_COMPRESSIONS = {".tar.gz": "gz", ".tgz": "gz", ".tar.xz": "xz", ".tar.zst": "zst"}
+_which_cache: dict[str, str | None] = {}
+
+
+def _tar_compression(filename: str) -> str | None:
+    for suffix, compression in _TAR_COMPRESSIONS.items():
+        if filename.endswith(suffix):
+            return compression
+    return None
+
+
+def _decompress_command(compression: str) -> list[str] | None:
+    # MISE_ANIAAN_DECOMPRESS: auto (default), stdlib, or system to require the tool
+    backend = os.environ.get("MISE_ANIAAN_DECOMPRESS", "auto")
+    if backend == "stdlib" and compression != "zst":
+        return None
+
+    name, *args = _DECOMPRESS_COMMANDS[compression]
+    if name not in _which_cache:
+        _which_cache[name] = shutil.which(name)
+    path = _which_cache[name]
+    if path:
+        return [path, *args]
+    if backend == "system" or compression == "zst":
+        raise Exception(f"{name} is required to decompress .{compression} archives")
+    return None
+
+
+def _pump(source: BinaryIO, sink: BinaryIO, errors: list[BaseException]):
+    try:
+        while chunk := source.read(_CHUNK_SIZE):
+            sink.write(chunk)
+    except BrokenPipeError:
+        pass
+    except BaseException as e:
+        errors.append(e)
+    finally:
+        try:
+            sink.close()
+        except BrokenPipeError:
+            pass
+
+
+@contextmanager
+def _decompress_process(source: BinaryIO, command: list[str]) -> Iterator[BinaryIO]:
+    import subprocess
+
+    # regular files go straight to the decoder's stdin, anything else is pumped
+    # from a thread so digests of streamed downloads still see every byte
+    direct = isinstance(source, io.BufferedReader)
+    proc = subprocess.Popen(
+        command,
+        stdin=source if direct else subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    assert proc.stdout is not None and proc.stderr is not None
+    errors: list[BaseException] = []
+    pump = None
+    if not direct:
+        pump = threading.Thread(
+            target=_pump, args=(source, proc.stdin, errors), daemon=True
+        )
+        pump.start()
+
+    try:
+        yield proc.stdout
+        # tar stops at its end-of-archive marker, drain the padding so the decoder exits
+        while proc.stdout.read(_CHUNK_SIZE):
+            pass
+    except BaseException:
+        proc.kill()
+        raise
+    finally:
+        if pump:
+            pump.join()
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode(errors="replace").strip()
+        proc.stderr.close()
+        returncode = proc.wait()
+
+    if errors:
+        raise errors[0]
+    if returncode != 0:
+        raise Exception(f"{Path(command[0]).name} failed ({returncode}): {stderr}")
+
+
+@contextmanager
+def _open_tar(source: BinaryIO, compression: str) -> Iterator[tarfile.TarFile]:
+    import tarfile
+
+    command = _decompress_command(compression)
+    _annotate(decompressor=Path(command[0]).name if command else "stdlib")
+    if not command:
+        mode = f"r|{compression}"
+        with tarfile.open(fileobj=source, mode=mode) as tar:  # type: ignore
+            yield tar
+        return
+
+    with _decompress_process(source, command) as stream:
+        with tarfile.open(fileobj=stream, mode="r|") as tar:
+            yield tar
+
+
+def _extract_tar(tar: tarfile.TarFile, extract_path: Path, members: MemberSelector):
+    select = _member_selector(members)
+    selected = (member for member in tar if select(member.name)) if select else None
+    tar.extractall(extract_path, members=selected, filter="data")
+
+
+def extract(
+    download_path: Path,
+    extract_path: Path,
+    bin_path: str,
+    members: MemberSelector = None,
+):
+    import zipfile
+
     filename = download_path.name
-    if filename.endswith(".tar.gz"):
-        with tarfile.open(download_path, mode="r:gz") as tar:
-            tar.extractall(extract_path, filter="data")
-    elif filename.endswith(".tar.xz"):
-        with tarfile.open(download_path, mode="r:xz") as tar:
-            tar.extractall(extract_path, filter="data")
+    compression = _tar_compression(filename)
+    if compression:
+        with open(download_path, "rb") as f, _open_tar(f, compression) as tar:
+            _extract_tar(tar, extract_path, members)
     elif filename.endswith(".gz"):
         dst = extract_path / bin_path
         dst.parent.mkdir(parents=True, exist_ok=True)
-        with gzip.open(download_path, "rb") as f_in:
-            dst.write_bytes(f_in.read())
+        command = _decompress_command("gz")
+        with open(download_path, "rb") as f, open(dst, "wb") as f_out:
+            if command:
+                with _decompress_process(f, command) as f_in:
+                    shutil.copyfileobj(f_in, f_out, _CHUNK_SIZE)
+            else:
+                import gzip
+
+                with gzip.open(f, "rb") as f_in:
+                    shutil.copyfileobj(f_in, f_out, _CHUNK_SIZE)
     elif filename.endswith(".zip"):
         with zipfile.ZipFile(download_path, "r") as zip_ref:
-            zip_ref.extractall(extract_path)
+            select = _member_selector(members)
+            names = [n for n in zip_ref.namelist() if select(n)] if select else None
+            zip_ref.extractall(extract_path, members=names)
     else:
         raise Exception(f"Unsupported file type: {filename}")
 
 
-def _download_file(url: str, download_path: Path):
-    print(f"Downloading {url} ...")
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
+_FICLONE = 0x40049409
 
-    req = Request(url=url, headers=headers)
 
-    with urlopen(req) as response:
-        download_path.write_bytes(response.read())
+def _fast_copy(src: Path | str, dst: Path | str):
+    # written next to dst and renamed over it: dst may be a hardlink into the
+    # dedup store that other installs share, truncating it would change them too
+    dst = Path(dst)
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        _copy_file(src, tmp_path)
+        os.replace(tmp_path, dst)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _copy_file(src: Path | str, dst: Path | str):
+    # reflink when the filesystem supports it, then in-kernel copy_file_range
+    with open(src, "rb") as f_src, open(dst, "wb") as f_dst:
+        copied = False
+        if sys.platform == "linux":
+            import fcntl
+
+            try:
+                fcntl.ioctl(f_dst.fileno(), _FICLONE, f_src.fileno())
+                copied = True
+            except OSError:
+                pass
+        if not copied and hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(
+                    f_src.fileno(), f_dst.fileno(), _CHUNK_SIZE * 16
+                ):
+                    pass
+                copied = True
+            except OSError:
+                f_src.seek(0)
+                f_dst.seek(0)
+                f_dst.truncate()
+        if not copied:
+            shutil.copyfileobj(f_src, f_dst, _CHUNK_SIZE)
+    shutil.copystat(src, dst)
+
+
+def promote_file(src: Path, dst: Path):
+    try:
+        os.replace(src, dst)
+    except OSError:
+        _fast_copy(src, dst)
 
 
-def _get_github_api_checker(file_path: Path, format_kwargs: FormatKwargs):
-    print(f"_get_github_api_checker: file_path: {file_path}")
-    tag_url = API_TAG_INFO_URL.format(**format_kwargs)
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
+def promote_tree(src: Path, dst: Path):
+    if dst.is_dir() and not any(dst.iterdir()):
+        dst.rmdir()
+    if not dst.exists():
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(src, dst)
+            return
+        except OSError:
+            shutil.copytree(src, dst, symlinks=True, copy_function=_fast_copy)
+            return
+
+    for entry in src.iterdir():
+        target = dst / entry.name
+        if entry.is_dir() and not entry.is_symlink() and target.is_dir():
+            promote_tree(entry, target)
+        elif target.is_dir() and not target.is_symlink():
+            shutil.rmtree(target)
+            promote_tree(entry, target)
+        elif entry.is_dir() and not entry.is_symlink():
+            target.unlink(missing_ok=True)
+            promote_tree(entry, target)
+        else:
+            promote_file(entry, target)
 
-    req = Request(url=tag_url, headers=headers)
 
-    with urlopen(req) as response:
-        if response.status != 200:
-            raise Exception(f"{tag_url} status: {response.status}")
+# opt-in: MISE_ANIAAN_DEDUP=1 hardlinks identical installed files across versions
+# through a content store keyed by (sha256, mode); `gc` drops blobs no install uses
+def _dedup_enabled() -> bool:
+    return os.environ.get("MISE_ANIAAN_DEDUP", "0") == "1"
+
+
+def _store_dir() -> Path:
+    return CACHE_DIR / "store"
+
+
+def _store_path(sha256: str, mode: int) -> Path:
+    return _store_dir() / sha256[:2] / f"{sha256}-{mode:o}"
 
-        data = json.loads(response.read())
-        filename = file_path.name
-        api_sha256sum = None
 
-        for item in data["assets"]:
-            if item["name"] == filename:
-                api_sha256sum = item["digest"].split("sha256:")[-1]
+def dedup_tree(root: Path) -> tuple[int, int]:
+    import stat
+
+    linked = saved = 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            path = Path(dirpath) / name
+            st = path.lstat()
+            # links already (an earlier dedup, or hardlinks from the archive)
+            if not stat.S_ISREG(st.st_mode) or st.st_size == 0 or st.st_nlink > 1:
+                continue
+            blob_path = _store_path(
+                file_digest(path, "sha256"), stat.S_IMODE(st.st_mode)
+            )
+            try:
+                blob_path.parent.mkdir(parents=True, exist_ok=True)
+                for _ in range(2):
+                    try:
+                        # the first copy of a file becomes the blob
+                        os.link(path, blob_path)
+                        break
+                    except FileExistsError:
+                        pass
+                    if blob_path.stat().st_size != st.st_size:
+                        # modified in place through another install
+                        blob_path.unlink()
+                        continue
+                    tmp_path = path.with_name(f".{name}.dedup")
+                    try:
+                        os.link(blob_path, tmp_path)
+                    except FileNotFoundError:
+                        # collected by a concurrent gc
+                        continue
+                    os.replace(tmp_path, path)
+                    linked += 1
+                    saved += st.st_size
+                    break
+            except OSError as e:
+                # e.g. the store is on another filesystem than the install
+                print(f"dedup: skipping {root}: {e}", file=sys.stderr)
+                return linked, saved
+    return linked, saved
+
+
+def gc_store() -> tuple[int, int]:
+    removed = freed = 0
+    for blob_path in _store_dir().glob("*/*"):
+        st = blob_path.lstat()
+        if st.st_nlink == 1:
+            blob_path.unlink(missing_ok=True)
+            removed += 1
+            freed += st.st_size
+    return removed, freed
+
+
+def _staging_parent(install_path: str) -> Path | None:
+    # stage next to install_path so promotion is a rename on the same filesystem
+    parent = Path(install_path).parent
+    if parent.is_dir() and os.access(parent, os.W_OK):
+        return parent
+    return None
+
+
+_DOWNLOAD_ATTEMPTS = 3
+_DOWNLOAD_RETRY_DELAY = 1.0
+
+
+def _partial_paths(url: str) -> tuple[Path, Path]:
+    import hashlib
+
+    key = hashlib.sha256(url.encode()).hexdigest()
+    base = CACHE_DIR / "partial" / key
+    return base, base.with_name(f"{key}.json")
+
+
+def _if_range(validators: dict[str, Any]) -> str | None:
+    # If-Range needs a strong etag, a weak one can only fall back to the date
+    etag = validators.get("etag")
+    if etag and not etag.startswith("W/"):
+        return etag
+    return validators.get("last_modified")
+
+
+def _has_partial(url: str) -> bool:
+    return _partial_paths(url)[0].exists()
+
+
+def _restore_partial(url: str, download_path: Path) -> dict[str, Any]:
+    part_path, meta_path = _partial_paths(url)
+    if not part_path.exists():
+        return {}
+    validators = _read_json(meta_path)
+    try:
+        if (
+            isinstance(validators, dict)
+            and validators.get("url") == url
+            and _if_range(validators)
+        ):
+            shutil.move(part_path, download_path)
+            return validators
+    except OSError:
+        pass
+    finally:
+        part_path.unlink(missing_ok=True)
+        meta_path.unlink(missing_ok=True)
+    return {}
+
+
+def _save_partial(url: str, download_path: Path, validators: dict[str, Any]):
+    # keep what we have for the next run, it is resumed with If-Range so a
+    # changed asset is refetched from scratch rather than spliced
+    if not _if_range(validators) or not download_path.exists():
+        return
+    if download_path.stat().st_size == 0:
+        return
+    part_path, meta_path = _partial_paths(url)
+    try:
+        part_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(download_path, part_path)
+    except OSError as e:
+        print(
+            f"cache: failed to keep partial download {part_path}: {e}", file=sys.stderr
+        )
+        return
+    _write_json_atomic(meta_path, {**validators, "url": url})
+    print(f"Kept {part_path.stat().st_size} bytes of {url} to resume later")
+
+
+def _content_range(response: http.client.HTTPResponse) -> tuple[int | None, int | None]:
+    # "bytes 100-199/1000" -> (100, 1000), "bytes */1000" -> (None, 1000)
+    value = response.getheader("Content-Range") or ""
+    unit, _, spec = value.partition(" ")
+    if unit != "bytes" or "/" not in spec:
+        return None, None
+    byte_range, _, total = spec.partition("/")
+    first = byte_range.partition("-")[0]
+    return (
+        int(first) if first.isdigit() else None,
+        int(total) if total.isdigit() else None,
+    )
+
+
+# opt-in: MISE_ANIAAN_CONNECTIONS=N splits assets above the threshold into N ranges
+_RANGE_THRESHOLD = 16 * 1024 * 1024
+
+
+def _download_connections() -> int:
+    return max(1, int(os.environ.get("MISE_ANIAAN_CONNECTIONS", "1")))
+
+
+class _TokenBucket:
+    # shared byte budget, refilled at rate bytes/s with at most burst seconds
+    # banked; a consumer that overdraws sleeps until the debt is paid off, so
+    # concurrent downloads share the rate
+    def __init__(self, rate: float, burst: float = 0.25):
+        self.rate = rate
+        self.capacity = rate * burst
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size: int):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= size
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+_bandwidth: contextvars.ContextVar[_TokenBucket | None] = contextvars.ContextVar(
+    "bandwidth", default=None
+)
+
+
+class _RangeIgnored(ConnectionError):
+    # the server advertised byte ranges but answered one with a full body, or the
+    # asset changed under If-Range; the download carries on as a single stream
+    pass
+
+
+def _throttle(size: int):
+    bucket = _bandwidth.get()
+    if bucket:
+        bucket.consume(size)
+
+
+def _fetch_segment(
+    url: str,
+    fd: int,
+    start: int,
+    end: int,
+    if_range: str,
+    progress: list[int],
+    index: int,
+    response: http.client.HTTPResponse | None = None,
+):
+    import http.client
+
+    for attempt in range(1, _DOWNLOAD_ATTEMPTS + 1):
+        pos = start + progress[index]
+        if pos > end:
+            return
+        try:
+            if response is None:
+                with _http.request(
+                    url, headers={"Range": f"bytes={pos}-{end}", "If-Range": if_range}
+                ) as ranged:
+                    first, _ = _content_range(ranged)
+                    if ranged.status != 206 or first != pos:
+                        _http.abandon(ranged)
+                        raise _RangeIgnored(
+                            f"{url} ignored range {pos}-{end} ({ranged.status})"
+                        )
+                    _copy_range(ranged, fd, pos, end, progress, index)
+            else:
+                _copy_range(response, fd, pos, end, progress, index)
+            return
+        except _RangeIgnored:
+            raise
+        except (OSError, http.client.HTTPException) as e:
+            response = None
+            if attempt == _DOWNLOAD_ATTEMPTS:
+                raise
+            print(f"Range {start}-{end} interrupted ({e}), retrying ...")
+            time.sleep(_DOWNLOAD_RETRY_DELAY * (attempt - 1))
+
+
+def _copy_range(
+    response: http.client.HTTPResponse,
+    fd: int,
+    pos: int,
+    end: int,
+    progress: list[int],
+    index: int,
+):
+    while pos <= end:
+        chunk = response.read(min(_CHUNK_SIZE, end - pos + 1))
+        if not chunk:
+            raise ConnectionError(
+                f"connection closed at byte {pos} of range ending {end}"
+            )
+        os.pwrite(fd, chunk, pos)
+        pos += len(chunk)
+        progress[index] += len(chunk)
+        _throttle(len(chunk))
+
+
+def _fetch_ranges(
+    url: str,
+    download_path: Path,
+    response: http.client.HTTPResponse,
+    total: int,
+    if_range: str,
+    connections: int,
+):
+    from concurrent.futures import ThreadPoolExecutor
+
+    # the response already streaming the whole asset serves the first range,
+    # the others are fetched concurrently and written in place
+    part = -(-total // connections)
+    bounds = [(start, min(start + part, total) - 1) for start in range(0, total, part)]
+    progress = [0] * len(bounds)
+
+    fd = os.open(download_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, total)
+            except OSError:
+                os.ftruncate(fd, total)
+        else:
+            os.ftruncate(fd, total)
+
+        with ThreadPoolExecutor(max_workers=len(bounds) - 1) as pool:
+            futures = [
+                pool.submit(
+                    contextvars.copy_context().run,
+                    _fetch_segment,
+                    url,
+                    fd,
+                    start,
+                    end,
+                    if_range,
+                    progress,
+                    i,
+                )
+                for i, (start, end) in enumerate(bounds)
+                if i > 0
+            ]
+            first_error = None
+            try:
+                _fetch_segment(
+                    url, fd, *bounds[0], if_range, progress, 0, response=response
+                )
+            except BaseException as e:
+                first_error = e
+            finally:
+                # the rest of this body belongs to the other ranges
+                _http.abandon(response)
+            for future in futures:
+                try:
+                    future.result()
+                except BaseException as e:
+                    first_error = first_error or e
+        if first_error:
+            # keep only the contiguous prefix so a sequential resume can pick it up
+            prefix = 0
+            for (start, end), done in zip(bounds, progress):
+                prefix += done
+                if start + done <= end:
+                    break
+            os.ftruncate(fd, prefix)
+            raise first_error
+    finally:
+        os.close(fd)
+
+
+def _fetch_into(
+    url: str,
+    download_path: Path,
+    validators: dict[str, Any],
+    hashers: dict[str, Any],
+    attrs: dict[str, Any],
+    connections: int,
+):
+    import hashlib
+
+    offset = download_path.stat().st_size if download_path.exists() else 0
+    if_range = _if_range(validators)
+    headers = {}
+    if offset and if_range:
+        headers = {"Range": f"bytes={offset}-", "If-Range": if_range}
+
+    start = time.perf_counter()
+    with _http.request(url, headers=headers) as response:
+        attrs.setdefault("ttfb_ms", round((time.perf_counter() - start) * 1000, 3))
+        first, total = _content_range(response)
+        if response.status == 416 and total == offset == validators.get("length"):
+            # everything had arrived before the connection dropped
+            response.read()
+            mode = None
+        elif response.status == 206 and first == offset:
+            mode = "ab"
+        else:
+            _check_status(url, response)
+            offset, mode = 0, "wb"
+            total = response.length
+            validators.clear()
+            validators.update(
+                etag=response.getheader("ETag"),
+                last_modified=response.getheader("Last-Modified"),
+                length=total,
+            )
+
+        for algorithm in hashers:
+            hashers[algorithm] = hashlib.new(algorithm)
+        if offset:
+            # the digest covers the whole file, rehash what is already on disk
+            with open(download_path, "rb") as f:
+                while chunk := f.read(_CHUNK_SIZE):
+                    for hasher in hashers.values():
+                        hasher.update(chunk)
+        if (
+            mode == "wb"
+            and connections > 1
+            and total
+            and total >= _RANGE_THRESHOLD
+            and response.getheader("Accept-Ranges") == "bytes"
+            and _if_range(validators)
+        ):
+            attrs["connections"] = connections
+            if_range: str = _if_range(validators)  # type: ignore
+            _fetch_ranges(url, download_path, response, total, if_range, connections)
+            attrs["bytes"] = attrs.get("bytes", 0) + total
+            with open(download_path, "rb") as f:
+                while chunk := f.read(_CHUNK_SIZE):
+                    for hasher in hashers.values():
+                        hasher.update(chunk)
+        elif mode:
+            with open(download_path, mode) as f:
+                while chunk := response.read(_CHUNK_SIZE):
+                    f.write(chunk)
+                    _throttle(len(chunk))
+                    attrs["bytes"] = attrs.get("bytes", 0) + len(chunk)
+                    for hasher in hashers.values():
+                        hasher.update(chunk)
+
+    size = download_path.stat().st_size
+    if validators.get("length") is not None and size != validators["length"]:
+        raise ConnectionError(
+            f"connection closed after {size} of {validators['length']} bytes"
+        )
+
+
+def _download_file(
+    url: str, download_path: Path, algorithms: tuple[str, ...] = ("sha256",)
+) -> dict[str, str]:
+    import hashlib
+    import http.client
+
+    print(f"Downloading {url} ...")
+    hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+
+    with span("download", url=url) as attrs:
+        validators = _restore_partial(url, download_path)
+        if validators:
+            attrs["resumed_from"] = download_path.stat().st_size
+            print(f"Resuming {url} from byte {attrs['resumed_from']} ...")
+
+        connections = _download_connections()
+        for attempt in range(1, _DOWNLOAD_ATTEMPTS + 1):
+            try:
+                _fetch_into(url, download_path, validators, hashers, attrs, connections)
                 break
+            except (OSError, http.client.HTTPException, HttpError) as e:
+                if isinstance(e, _RangeIgnored):
+                    # the contiguous prefix is kept, the rest comes over one stream
+                    connections = 1
+                    attrs["ranges_ignored"] = True
+                retryable = not isinstance(e, HttpError) or e.status >= 500
+                if not retryable or attempt == _DOWNLOAD_ATTEMPTS:
+                    _save_partial(url, download_path, validators)
+                    raise
+                print(f"Download interrupted ({e}), retrying ...")
+                attrs["retries"] = attempt
+                time.sleep(_DOWNLOAD_RETRY_DELAY * (attempt - 1))
+            except KeyboardInterrupt:
+                _save_partial(url, download_path, validators)
+                raise
+        stat = download_path.stat()
+
+    digests = {algorithm: hasher.hexdigest() for algorithm, hasher in hashers.items()}
+    _download_digests[str(download_path)] = (stat.st_size, stat.st_mtime_ns, digests)
+    return digests
+
+
+def _artifact_cache_enabled() -> bool:
+    return os.environ.get("MISE_ANIAAN_ARTIFACT_CACHE", "1") != "0"
+
+
+def _artifact_index_path(url: str) -> Path:
+    import hashlib
+
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return CACHE_DIR / "artifacts" / "index" / f"{key}.json"
 
-        if not api_sha256sum:
+
+def _artifact_blob_path(sha256: str) -> Path:
+    return CACHE_DIR / "artifacts" / "blobs" / sha256
+
+
+def _is_pinned_version(version: str) -> bool:
+    # moving tags such as neovim's "nightly" or "stable" reuse the same url
+    return any(c.isdigit() for c in version)
+
+
+def _link_or_copy(src: Path, dst: Path):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _artifact_cached(url: str, checksum_filename: str) -> bool:
+    entry = _read_json(_artifact_index_path(url))
+    sidecar = "digest" if checksum_filename == GITHUB_CHECKER_FLAG else "checksum"
+    return (
+        isinstance(entry, dict)
+        and entry.get("url") == url
+        and (not checksum_filename or sidecar in entry)
+        and _artifact_blob_path(entry["sha256"]).exists()
+    )
+
+
+def _artifact_cache_lookup(url: str, download_path: Path) -> dict | None:
+    entry = _read_json(_artifact_index_path(url))
+    if not isinstance(entry, dict) or entry.get("url") != url:
+        return None
+
+    blob_path = _artifact_blob_path(entry["sha256"])
+    if not blob_path.exists():
+        return None
+
+    if file_digest(blob_path, "sha256") != entry["sha256"]:
+        print(f"cache: corrupt artifact {blob_path}, discarding", file=sys.stderr)
+        blob_path.unlink(missing_ok=True)
+        return None
+
+    _link_or_copy(blob_path, download_path)
+    stat = download_path.stat()
+    _download_digests[str(download_path)] = (
+        stat.st_size,
+        stat.st_mtime_ns,
+        {"sha256": entry["sha256"]},
+    )
+    print(f"Using cached artifact {url} (sha256:{entry['sha256']})")
+    return entry
+
+
+def _artifact_blob_store(file_path: Path) -> str:
+    sha256 = file_digest(file_path, "sha256")
+    blob_path = _artifact_blob_path(sha256)
+    if not blob_path.exists():
+        blob_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = blob_path.with_name(f".{sha256}.{os.getpid()}.tmp")
+        _link_or_copy(file_path, tmp_path)
+        os.replace(tmp_path, blob_path)
+    return sha256
+
+
+def _artifact_cache_store(url: str, download_path: Path, sidecar: dict[str, Any]):
+    # sidecar is what the plugin checker needs to re-run on a hit: the checksum
+    # or signature file ("checksum") or the GitHub API digest ("digest")
+    entry: dict[str, Any] = {"url": url, "filename": download_path.name}
+    try:
+        entry["sha256"] = _artifact_blob_store(download_path)
+        checksum_path = sidecar.get("checksum")
+        if checksum_path:
+            entry["checksum"] = {
+                "name": checksum_path.name,
+                "sha256": _artifact_blob_store(checksum_path),
+            }
+        if sidecar.get("digest"):
+            entry["digest"] = sidecar["digest"]
+    except OSError as e:
+        print(f"cache: failed to store {url}: {e}", file=sys.stderr)
+        return
+
+    _write_json_atomic(_artifact_index_path(url), entry)
+
+
+@dataclass
+class _Checker:
+    verify: Callable[[Path], None]
+    # expected digest by file name, set when the check is a plain digest
+    # comparison and can therefore be done against digests computed in flight
+    digest_for: Callable[[str], str | None] | None = None
+    # re-fetches digest_for's source once after a mismatch, True if it did
+    refresh: Callable[[], bool] | None = None
+
+
+def _digest_matches(file_path: Path, expected: str) -> bool:
+    algorithm, expected = parse_digest(expected)
+    return file_digest(file_path, algorithm) == expected
+
+
+def _digest_checker(
+    digest_for: Callable[[str], str | None], refresh: Callable[[], bool] | None = None
+) -> _Checker:
+    def verify(file_path: Path):
+        expected = digest_for(file_path.name)
+        if not expected:
+            return
+        if refresh and not _digest_matches(file_path, expected) and refresh():
+            expected = digest_for(file_path.name)
+        if expected:
+            verify_digest(file_path=file_path, expected=expected)
+
+    return _Checker(verify=verify, digest_for=digest_for, refresh=refresh)
+
+
+def _get_github_api_checker(format_kwargs: FormatKwargs) -> _Checker:
+    repo_name, tag = format_kwargs["repo_name"], format_kwargs["version"]
+    tag_url = API_TAG_INFO_URL.format(**format_kwargs)
+    filename = Path(format_kwargs["filename"]).name
+
+    def fetch_tag() -> dict[str, dict]:
+        print(f"_get_github_api_checker: {tag_url}")
+        response = _api.get(tag_url)
+        _check_status(tag_url, response)
+        data = json.loads(response.read())
+        _update_asset_index(repo_name, [data], replace=False)
+        return _index_entries(data)
+
+    # moving tags (neovim nightly/stable) get new assets under the same name,
+    # only the tag API knows their current digest
+    assets = _asset_index_lookup(repo_name, tag) if _is_pinned_version(tag) else None
+    state = {"assets": assets, "indexed": True}
+    if assets and (assets.get(filename) or {}).get("digest"):
+        _annotate(asset_index="hit")
+    else:
+        # not listed yet, or listed before GitHub published a digest for it
+        _annotate(asset_index="miss")
+        state = {"assets": fetch_tag(), "indexed": False}
+
+    def digest_for(filename: str) -> str:
+        api_digest = (state["assets"].get(filename) or {}).get("digest")
+        if not api_digest:
             raise Exception(f"{tag_url} digest is null")
+        return api_digest
+
+    def refresh() -> bool:
+        # the index may predate a re-uploaded asset, ask the tag API once
+        if not state["indexed"]:
+            return False
+        state.update(assets=fetch_tag(), indexed=False)
+        return True
 
-        verify_by_sha256sum(file_path=file_path, expected=api_sha256sum)
+    return _digest_checker(digest_for, refresh)
 
 
 def _get_checker(
@@ -293,14 +2213,12 @@ def _get_checker(
     download_dir: Path,
     checksum_filename: str,
     format_kwargs: FormatKwargs,
-) -> Callable[[Path], None]:
+) -> _Checker:
     if not checksum_filename:
-        return lambda _: None
+        return _digest_checker(lambda _: None)
 
     if checksum_filename == GITHUB_CHECKER_FLAG:
-        return lambda file_path: _get_github_api_checker(
-            file_path=file_path, format_kwargs=format_kwargs
-        )
+        return _get_github_api_checker(format_kwargs=format_kwargs)
 
     checksum_url = (
         checksum_filename
@@ -311,23 +2229,201 @@ def _get_checker(
     )
     checksum_path = download_dir / Path(checksum_filename).name
     _download_file(url=checksum_url, download_path=checksum_path)
+    return _checksum_file_checker(plugin, checksum_path, format_kwargs)
+
 
+def _checksum_file_checker(
+    plugin: Plugin, checksum_path: Path, format_kwargs: FormatKwargs
+) -> _Checker:
     if plugin.custom_checker:
-        checker = lambda file_path: plugin.custom_checker(
-            file_path, checksum_path, format_kwargs
-        )  # type: ignore
-    else:
-        checker = lambda file_path: verify_by_sha256sum_with_checksum_path(
-            file_path, checksum_path
+        return _Checker(
+            verify=lambda file_path: plugin.custom_checker(
+                file_path, checksum_path, format_kwargs
+            )  # type: ignore
         )
 
-    return checker
+    return _digest_checker(lambda filename: read_checksum_file(checksum_path, filename))
 
 
-def install_version(plugin_name: str, normalize_version: str, install_path: str):
-    plugin = get_plugin(plugin_name)
-    plat, arch = get_system_info()
+def _checker_sidecar(
+    checker: _Checker, download_dir: Path, filename: str, checksum_filename: str
+) -> dict[str, Any]:
+    if checksum_filename == GITHUB_CHECKER_FLAG:
+        assert checker.digest_for is not None
+        return {"digest": checker.digest_for(filename)}
+    if checksum_filename:
+        return {"checksum": download_dir / Path(checksum_filename).name}
+    return {}
+
+
+def _cached_checker(
+    plugin: Plugin, entry: dict, download_dir: Path, format_kwargs: FormatKwargs
+) -> _Checker | None:
+    # a cache hit still runs the plugin's check, against the sidecar stored with
+    # the blob rather than one fetched again. None when the entry has no sidecar
+    checksum_filename = format_kwargs["checksum_filename"]
+    if not checksum_filename:
+        return _digest_checker(lambda _: None)
+
+    if checksum_filename == GITHUB_CHECKER_FLAG:
+        digest = entry.get("digest")
+        return _digest_checker(lambda _: digest) if digest else None
 
+    checksum = entry.get("checksum")
+    if not isinstance(checksum, dict):
+        return None
+    checksum_path = download_dir / Path(checksum_filename).name
+    try:
+        _link_or_copy(_artifact_blob_path(checksum["sha256"]), checksum_path)
+    except OSError:
+        return None
+    return _checksum_file_checker(plugin, checksum_path, format_kwargs)
+
+
+class _DigestReader:
+    def __init__(
+        self,
+        url: str,
+        response: http.client.HTTPResponse,
+        algorithms: tuple[str, ...],
+        sink: Path | None,
+    ):
+        import hashlib
+        import http.client
+        from contextlib import ExitStack
+
+        self._url = url
+        self._response = response
+        self._validators = {
+            "etag": response.getheader("ETag"),
+            "last_modified": response.getheader("Last-Modified"),
+        }
+        self._errors = (OSError, http.client.HTTPException)
+        self._resumed = ExitStack()
+        self._broken = False
+        self._hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+        self._sink = open(sink, "wb") if sink else None
+        self.size = 0
+
+    def _resume(self):
+        # continue the same byte stream on a new connection, tarfile never notices
+        self._resumed.close()
+        if_range: str = _if_range(self._validators)  # type: ignore
+        response = self._resumed.enter_context(
+            _http.request(
+                self._url,
+                headers={"Range": f"bytes={self.size}-", "If-Range": if_range},
+            )
+        )
+        first, _ = _content_range(response)
+        if response.status != 206 or first != self.size:
+            raise Exception(
+                f"{self._url} cannot be resumed at byte {self.size} ({response.status})"
+            )
+        self._response = response
+        self._broken = False
+
+    def _read_response(self, size: int) -> bytes:
+        attempt = 0
+        while True:
+            try:
+                if self._broken:
+                    self._resume()
+                chunk = self._response.read(size if size >= 0 else None)
+                if not chunk and size != 0 and self._response.length:
+                    raise ConnectionError(f"connection closed after {self.size} bytes")
+                return chunk
+            except self._errors as e:
+                attempt += 1
+                if attempt >= _DOWNLOAD_ATTEMPTS or not _if_range(self._validators):
+                    raise
+                print(f"Download interrupted ({e}), resuming from byte {self.size} ...")
+                _annotate(retries=attempt)
+                time.sleep(_DOWNLOAD_RETRY_DELAY * (attempt - 1))
+                self._broken = True
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self._read_response(size)
+        self.size += len(chunk)
+        for hasher in self._hashers.values():
+            hasher.update(chunk)
+        if self._sink:
+            self._sink.write(chunk)
+        return chunk
+
+    def finish(self) -> dict[str, str]:
+        # tar streams stop at the end-of-archive marker, hash the trailing padding too
+        while self.read(_CHUNK_SIZE):
+            pass
+        if self._sink:
+            self._sink.close()
+        return {
+            algorithm: hasher.hexdigest() for algorithm, hasher in self._hashers.items()
+        }
+
+    def close(self):
+        self._resumed.close()
+        if self._sink:
+            self._sink.close()
+
+
+def _stream_compression(filename: str) -> str | None:
+    if os.environ.get("MISE_ANIAAN_STREAM", "1") == "0":
+        return None
+    return _tar_compression(filename)
+
+
+def _download_and_extract(
+    url: str,
+    compression: str,
+    extract_path: Path,
+    members: MemberSelector = None,
+    sink: Path | None = None,
+) -> tuple[dict[str, str], int]:
+    print(f"Downloading and extracting {url} ...")
+    with span("download", url=url, streamed=True) as attrs:
+        start = time.perf_counter()
+        with _http.request(url) as response:
+            attrs["ttfb_ms"] = round((time.perf_counter() - start) * 1000, 3)
+            _check_status(url, response)
+            reader = _DigestReader(url, response, ("sha256",), sink)
+            try:
+                with _open_tar(reader, compression) as tar:  # type: ignore
+                    _extract_tar(tar, extract_path, members)
+                digests = reader.finish()
+            finally:
+                reader.close()
+        attrs["bytes"] = reader.size
+
+    if sink:
+        stat = sink.stat()
+        _download_digests[str(sink)] = (stat.st_size, stat.st_mtime_ns, digests)
+    return digests, reader.size
+
+
+def _verify_streamed(checker: _Checker, filename: str, digests: dict[str, str]):
+    assert checker.digest_for is not None
+    expected = checker.digest_for(filename)
+    if not expected:
+        return
+
+    print(f"Verifying checksum for {filename}...")
+    algorithm, expected = parse_digest(expected)
+    actual = digests.get(algorithm)
+    if actual != expected and checker.refresh and checker.refresh():
+        algorithm, expected = parse_digest(checker.digest_for(filename) or "")
+        actual = digests.get(algorithm)
+    if actual is None:
+        raise Exception(f"Cannot verify {algorithm} digest of streamed {filename}")
+    if actual != expected:
+        raise Exception(
+            f"Checksum verification failed: {actual} != {expected} for {filename}"
+        )
+    print("Checksum verification passed")
+
+
+def get_format_kwargs(plugin: Plugin, normalize_version: str) -> FormatKwargs:
+    plat, arch = get_system_info()
     platform_name = plugin.platform_map[plat] if plugin.platform_map else plat
     arch_name = plugin.arch_map[arch] if plugin.arch_map else arch
 
@@ -351,86 +2447,791 @@ def install_version(plugin_name: str, normalize_version: str, install_path: str)
     )
     format_kwargs["checksum_filename"] = checksum_filename
 
+    return format_kwargs
+
+
+def install_version(plugin_name: str, normalize_version: str, install_path: str):
+    with span("install", plugin=plugin_name, version=normalize_version):
+        _install_version(plugin_name, normalize_version, install_path)
+
+
+@dataclass
+class _Asset:
+    plugin: Plugin
+    format_kwargs: FormatKwargs
+    bin_path: str
+    members: str | None
+    download_url: str
+
+
+def _resolve_asset(plugin_name: str, normalize_version: str) -> _Asset:
+    plugin = get_plugin(plugin_name)
+    format_kwargs = get_format_kwargs(plugin, normalize_version)
+    filename = format_kwargs["filename"]
+
     bin_path = format_template(plugin.bin_path, format_kwargs)
 
+    if plugin.extract_members:
+        members = format_template(plugin.extract_members, format_kwargs)
+    elif not plugin.custom_copy:
+        members = bin_path
+    else:
+        members = None
+
     download_url = (
         filename if filename.startswith("https") else BINARY_URL.format(**format_kwargs)
     )
+    return _Asset(plugin, format_kwargs, bin_path, members, download_url)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
+
+def _install_version(plugin_name: str, normalize_version: str, install_path: str):
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    with span("resolve"):
+        asset = _resolve_asset(plugin_name, normalize_version)
+        plugin, format_kwargs = asset.plugin, asset.format_kwargs
+        bin_path, members, download_url = (
+            asset.bin_path,
+            asset.members,
+            asset.download_url,
+        )
+        version = format_kwargs["version"]
+        filename = format_kwargs["filename"]
+        checksum_filename = format_kwargs["checksum_filename"]
+
+    with tempfile.TemporaryDirectory() as tmp_dir, tempfile.TemporaryDirectory(
+        prefix=f".{plugin.name}-staging-", dir=_staging_parent(install_path)
+    ) as staging_dir:
         tmp_path = Path(tmp_dir)
         download_path = tmp_path / Path(filename).name
 
-        _download_file(url=download_url, download_path=download_path)
+        extract_path = Path(staging_dir) / "extract"
+        extract_path.mkdir(exist_ok=True)
 
+        use_cache = _artifact_cache_enabled() and _is_pinned_version(version)
+        entry = (
+            _artifact_cache_lookup(download_url, download_path) if use_cache else None
+        )
+        cached_checker = entry and _cached_checker(
+            plugin, entry, tmp_path, format_kwargs
+        )
+        if entry and not cached_checker:
+            # stored before sidecars were kept, download and verify afresh
+            download_path.unlink()
+        cache_hit = cached_checker is not None
+        _annotate(cache="hit" if cache_hit else "miss" if use_cache else "off")
+
+        # digest-checked tarballs are piped straight from the response into
+        # tarfile, extract_path only gets promoted once the digest matches.
+        # a download interrupted on an earlier run resumes through _download_file
+        stream_compression = (
+            _stream_compression(download_path.name)
+            if plugin.is_compressed
+            and plugin.checksum_stage == "download"
+            and not plugin.custom_checker
+            and not _has_partial(download_url)
+            else None
+        )
+        streamed = False
+
+        def fetch_checker() -> _Checker:
+            with span("checksum_fetch", checksum=checksum_filename or None):
+                return _get_checker(
+                    plugin=plugin,
+                    download_dir=tmp_path,
+                    checksum_filename=checksum_filename,
+                    format_kwargs=format_kwargs,
+                )
+
+        if cached_checker:
+            checker = cached_checker
+            asset_size = download_path.stat().st_size
+        else:
+            # fetch the checksum/signature/tag info while the asset downloads
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                checker_future = pool.submit(
+                    contextvars.copy_context().run, fetch_checker
+                )
+                if stream_compression:
+                    digests, asset_size = _download_and_extract(
+                        url=download_url,
+                        compression=stream_compression,
+                        extract_path=extract_path,
+                        members=members,
+                        sink=download_path if use_cache else None,
+                    )
+                    streamed = True
+                else:
+                    _download_file(
+                        url=download_url,
+                        download_path=download_path,
+                        algorithms=_download_algorithms(checksum_filename),
+                    )
+                    asset_size = download_path.stat().st_size
+                checker = checker_future.result()
+        _annotate(asset_size=asset_size, streamed=streamed)
+
+        if plugin.checksum_stage == "download":
+            with span("verify", stage="download"):
+                if streamed:
+                    _verify_streamed(checker, download_path.name, digests)
+                else:
+                    checker.verify(download_path)
+
+        if not streamed:
+            with span("extract", compressed=plugin.is_compressed):
+                if plugin.is_compressed:
+                    extract(
+                        download_path=download_path,
+                        extract_path=extract_path,
+                        bin_path=bin_path,
+                        members=members,
+                    )
+                else:
+                    _fast_copy(download_path, extract_path / bin_path)
+
+        if plugin.checksum_stage == "extract":
+            with span("verify", stage="extract"):
+                checker.verify(extract_path / bin_path)
+
+        if use_cache and not cache_hit:
+            with span("cache_store"):
+                _artifact_cache_store(
+                    download_url,
+                    download_path,
+                    _checker_sidecar(
+                        checker, tmp_path, download_path.name, checksum_filename
+                    ),
+                )
+
+        with span("copy", custom=plugin.custom_copy is not None):
+            if not plugin.custom_copy:
+                print(f"{plugin.name}: Using default copy function...")
+                src = extract_path / bin_path
+                if not src.exists():
+                    raise Exception(f"Binary file not found: {src}")
+
+                dst = Path(install_path) / "bin"
+                dst.mkdir(parents=True, exist_ok=True)
+                dst = dst / plugin.cmd
+
+                promote_file(src, dst)
+                dst.chmod(0o755)
+            else:
+                print(f"{plugin.name} Using custom copy function...")
+                plugin.custom_copy(
+                    plugin, extract_path, Path(install_path), format_kwargs
+                )
+
+        if _dedup_enabled():
+            with span("dedup"):
+                linked, saved = dedup_tree(Path(install_path))
+                _annotate(linked=linked, saved=saved)
+            print(
+                f"{plugin.name}: {linked} files shared with other installs "
+                f"({saved / 1024 / 1024:.1f}MB)"
+            )
+
+    print(f"{plugin.name} Installation completed successfully!")
+
+
+_BUNDLE_INDEX = "plugins.idx"
+_BUNDLE_MAIN = "from lib.lib import main\n\nmain()\n"
+_bundle_index_cache: list[dict | None] = []
+
+
+def _bundle_index() -> dict | None:
+    # bundles ship the plugin index next to lib.lib instead of a plugins directory
+    if not _bundle_index_cache:
+        try:
+            index_path = str(Path(__file__).parent / _BUNDLE_INDEX)
+            data = __loader__.get_data(index_path)  # type: ignore
+            _bundle_index_cache.append(marshal.loads(data))
+        except OSError:
+            _bundle_index_cache.append(None)
+    return _bundle_index_cache[0]
+
+
+def _source_stamps(lib_dir: Path) -> dict[str, tuple[int, int]]:
+    stamps = {}
+    for path in [lib_dir / "lib.py", *sorted((lib_dir / "plugins").glob("*.py"))]:
+        stat = path.stat()
+        stamps[path.relative_to(lib_dir).as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return stamps
+
+
+def _stale_bundle() -> Path | None:
+    # a bundle sitting next to the lib/ it was built from (the plugin checkout)
+    # must not keep running old code after that checkout is updated
+    lib_dir = Path(__file__).parent
+    if (lib_dir / "plugins").is_dir():
+        return None
+    index = _bundle_index()
+    sources_dir = lib_dir.parent.parent / "lib"
+    if index is None or not (sources_dir / "lib.py").is_file():
+        return None
+    if index.get("sources") == _source_stamps(sources_dir):
+        return None
+    return sources_dir
+
+
+def _loaded_stamps() -> dict[str, tuple[int, int]]:
+    # the code this process runs: the lib/ checkout, or the bundle and the lib/
+    # it was built from
+    lib_dir = Path(__file__).parent
+    if (lib_dir / "plugins").is_dir():
+        return _source_stamps(lib_dir)
+    sources_dir = lib_dir.parent.parent / "lib"
+    stamps = _source_stamps(sources_dir) if (sources_dir / "lib.py").is_file() else {}
+    stat = lib_dir.parent.stat()
+    stamps[lib_dir.parent.name] = (stat.st_size, stat.st_mtime_ns)
+    return stamps
+
+
+def _stale_daemon(stamps: dict[str, tuple[int, int]]) -> bool:
+    try:
+        return _loaded_stamps() != stamps
+    except OSError:
+        # a file went away mid-update
+        return True
+
+
+def _pyc(code: types.CodeType) -> bytes:
+    from importlib.util import MAGIC_NUMBER
+
+    # timestamp pyc with no source alongside, zipimport loads it unchecked
+    return MAGIC_NUMBER + bytes(12) + marshal.dumps(code)
+
+
+def build_bundle(output: Path):
+    import zipfile
+
+    lib_dir = Path(__file__).parent
+    index = {
+        "tag": sys.implementation.cache_tag,
+        "plugins": _registry.entries(),
+        "sources": _source_stamps(lib_dir) if (lib_dir / "plugins").is_dir() else {},
+    }
+    modules = {
+        "__main__.pyc": compile(_BUNDLE_MAIN, "__main__.py", "exec"),
+        "lib/__init__.pyc": compile("", str(lib_dir / "__init__.py"), "exec"),
+        "lib/lib.pyc": compile(
+            (lib_dir / "lib.py").read_bytes(), str(lib_dir / "lib.py"), "exec"
+        ),
+    }
+
+    tmp_path = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(b"#!/usr/bin/env python3\n")
+        with zipfile.ZipFile(f, "w", compression=zipfile.ZIP_STORED) as bundle:
+            for name, code in modules.items():
+                bundle.writestr(name, _pyc(code))
+            bundle.writestr(f"lib/{_BUNDLE_INDEX}", marshal.dumps(index))
+    tmp_path.chmod(0o755)
+    os.replace(tmp_path, output)
+
+
+class ManifestItem(TypedDict):
+    plugin: str
+    version: str
+    path: str
+
+
+def load_manifest(manifest_path: Path) -> list[ManifestItem]:
+    content = manifest_path.read_text()
+    if manifest_path.suffix == ".toml":
+        import tomllib
+
+        data = tomllib.loads(content)
+    else:
+        data = json.loads(content)
+
+    if isinstance(data, dict):
+        data = data.get("tools", [])
+
+    items: list[ManifestItem] = []
+    for entry in data:
+        missing = [key for key in ("plugin", "version", "path") if key not in entry]
+        if missing:
+            raise Exception(f"Manifest entry {entry} is missing {', '.join(missing)}")
+        items.append(
+            {
+                "plugin": entry["plugin"],
+                "version": str(entry["version"]),
+                "path": os.path.abspath(entry["path"]),
+            }
+        )
+    return items
+
+
+def install_many(items: list[ManifestItem], jobs: int = 4) -> bool:
+    from concurrent.futures import ThreadPoolExecutor
+
+    def install(item: ManifestItem) -> tuple[float, str | None]:
+        start = time.monotonic()
+        try:
+            install_version(item["plugin"], item["version"], item["path"])
+        except Exception as e:
+            return time.monotonic() - start, str(e) or type(e).__name__
+        return time.monotonic() - start, None
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        # workers start with an empty context, carry over the --trace target
+        context = contextvars.copy_context()
+        results = [
+            future.result()
+            for future in [
+                pool.submit(context.copy().run, install, item) for item in items
+            ]
+        ]
+
+    print("Summary:")
+    for item, (elapsed, error) in zip(items, results):
+        status = "ok" if error is None else f"failed: {error}"
+        print(f"  {item['plugin']}@{item['version']} ({elapsed:.1f}s): {status}")
+
+    return all(error is None for _, error in results)
+
+
+def _download_algorithms(checksum_filename: str) -> tuple[str, ...]:
+    # prehashed minisign signatures cover BLAKE2b-512 of the asset
+    if checksum_filename and checksum_filename.endswith(".minisig"):
+        return ("sha256", "blake2b")
+    return ("sha256",)
+
+
+def prefetch_version(plugin_name: str, normalize_version: str) -> str:
+    import tempfile
+
+    asset = _resolve_asset(plugin_name, normalize_version)
+    plugin, format_kwargs = asset.plugin, asset.format_kwargs
+    checksum_filename = format_kwargs["checksum_filename"]
+
+    if not _is_pinned_version(format_kwargs["version"]):
+        return "skipped, moving tag"
+    if _artifact_cached(asset.download_url, checksum_filename):
+        return "already cached"
+
+    # staged next to the blobs so storing them is a hardlink
+    staging_parent = CACHE_DIR / "artifacts"
+    staging_parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(
+        prefix=".prefetch-", dir=staging_parent
+    ) as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        download_path = tmp_path / Path(format_kwargs["filename"]).name
         checker = _get_checker(
             plugin=plugin,
             download_dir=tmp_path,
             checksum_filename=checksum_filename,
             format_kwargs=format_kwargs,
         )
+        _download_file(
+            url=asset.download_url,
+            download_path=download_path,
+            algorithms=_download_algorithms(checksum_filename),
+        )
 
         if plugin.checksum_stage == "download":
-            checker(download_path)
+            checker.verify(download_path)
+        else:
+            # the checksum covers the binary, not the asset
+            extract_path = tmp_path / "extract"
+            extract_path.mkdir()
+            if plugin.is_compressed:
+                extract(
+                    download_path=download_path,
+                    extract_path=extract_path,
+                    bin_path=asset.bin_path,
+                    members=asset.members,
+                )
+            else:
+                _fast_copy(download_path, extract_path / asset.bin_path)
+            checker.verify(extract_path / asset.bin_path)
+
+        _artifact_cache_store(
+            asset.download_url,
+            download_path,
+            _checker_sidecar(checker, tmp_path, download_path.name, checksum_filename),
+        )
+    return "fetched"
 
-        extract_path = tmp_path / "extract"
-        extract_path.mkdir(exist_ok=True)
 
-        if plugin.is_compressed:
-            extract(
-                download_path=download_path,
-                extract_path=extract_path,
-                bin_path=bin_path,
-            )
-        else:
-            shutil.copy2(download_path, extract_path / bin_path)
+def prefetch(
+    plugin_names: list[str],
+    versions: int = 1,
+    jobs: int = 2,
+    limit_mbps: float | None = None,
+) -> bool:
+    if not _artifact_cache_enabled():
+        raise Exception(
+            "prefetch needs the artifact cache, unset MISE_ANIAAN_ARTIFACT_CACHE=0"
+        )
 
-        if plugin.checksum_stage == "extract":
-            checker(extract_path / bin_path)
+    token = _bandwidth.set(
+        _TokenBucket(limit_mbps * 1024 * 1024) if limit_mbps else None
+    )
+    try:
+        results = _prefetch(plugin_names, versions, jobs)
+    finally:
+        _bandwidth.reset(token)
+
+    print("Summary:")
+    for plugin_name, version, elapsed, status in results:
+        print(f"  {plugin_name}@{version} ({elapsed:.1f}s): {status}")
+
+    return not any(status.startswith("failed") for *_, status in results)
+
+
+def _prefetch(
+    plugin_names: list[str], versions: int, jobs: int
+) -> list[tuple[str, str, float, str]]:
+    from concurrent.futures import ThreadPoolExecutor
+
+    def fetch(item: tuple[str, str]) -> tuple[float, str]:
+        plugin_name, version = item
+        start = time.monotonic()
+        with span("prefetch", plugin=plugin_name, version=version):
+            try:
+                status = prefetch_version(plugin_name, version)
+            except Exception as e:
+                status = f"failed: {str(e) or type(e).__name__}"
+        return time.monotonic() - start, status
+
+    items: list[tuple[str, str]] = []
+    results: list[tuple[str, str, float, str]] = []
+    for plugin_name in plugin_names:
+        try:
+            newest = json.loads(list_version(plugin_name, limit=versions))
+        except Exception as e:
+            results.append((plugin_name, "-", 0.0, f"failed: {e}"))
+            continue
+        items += [(plugin_name, version) for version in reversed(newest)]
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        context = contextvars.copy_context()
+        futures = [pool.submit(context.copy().run, fetch, item) for item in items]
+        for (plugin_name, version), future in zip(items, futures):
+            results.append((plugin_name, version, *future.result()))
+    return results
+
+
+_DAEMON_IDLE_TIMEOUT = 600
+# settings a resident daemon has already applied; a caller whose values differ
+# is turned away and runs the one-shot CLI. keep in sync with lib/cli.lua
+_DAEMON_ENV = (
+    "GITHUB_TOKEN",
+    "GH_TOKEN",
+    "MISE_ANIAAN_GITHUB_TOKEN",
+    "MISE_ANIAAN_API_URL",
+    "MISE_ANIAAN_GITHUB_URL",
+    "MISE_ANIAAN_ARTIFACT_CACHE",
+    "MISE_ANIAAN_STREAM",
+    "MISE_ANIAAN_LIST_LIMIT",
+    "MISE_ANIAAN_MAX_RELEASE_PAGES",
+    "MISE_ANIAAN_TRACE",
+    "MISE_ANIAAN_DECOMPRESS",
+    "MISE_ANIAAN_CONNECTIONS",
+    "MISE_ANIAAN_HELPER_DIR",
+    "MISE_ANIAAN_MINISIGN",
+    "MISE_ANIAAN_DEDUP",
+    # _HttpClient resolves its proxy from these once, through getproxies()
+    "http_proxy",
+    "https_proxy",
+    "no_proxy",
+    "HTTP_PROXY",
+    "HTTPS_PROXY",
+    "NO_PROXY",
+)
 
-        if not plugin.custom_copy:
-            print(f"{plugin.name}: Using default copy function...")
-            src = extract_path / bin_path
-            if not src.exists():
-                raise Exception(f"Binary file not found: {src}")
 
-            dst = Path(install_path) / "bin"
-            dst.mkdir(parents=True, exist_ok=True)
-            dst = dst / plugin.cmd
+def _daemon_env() -> dict[str, str]:
+    return {key: os.environ[key] for key in _DAEMON_ENV if os.environ.get(key)}
 
-            shutil.copy2(src, dst)
-            dst.chmod(0o755)
-        else:
-            print(f"{plugin.name} Using custom copy function...")
-            plugin.custom_copy(plugin, extract_path, Path(install_path), format_kwargs)
 
-    print(f"{plugin.name} Installation completed successfully!")
+def daemon_socket_path() -> Path:
+    return Path(os.environ.get("MISE_ANIAAN_SOCKET") or CACHE_DIR / "daemon.sock")
 
 
-def main():
-    if len(sys.argv) < 3:
+_request_output: contextvars.ContextVar[io.StringIO | None] = contextvars.ContextVar(
+    "request_output", default=None
+)
+
+
+class _RequestOutput:
+    # stdout that follows the request's context, so concurrent daemon requests
+    # capture their own prints, including those from pool workers they started
+    def __init__(self, default):
+        self._default = default
+
+    @contextmanager
+    def capture(self) -> Iterator[io.StringIO]:
+        buffer = io.StringIO()
+        token = _request_output.set(buffer)
+        try:
+            yield buffer
+        finally:
+            _request_output.reset(token)
+
+    def write(self, text: str) -> int:
+        return (_request_output.get() or self._default).write(text)
+
+    def flush(self):
+        (_request_output.get() or self._default).flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._default, name)
+
+
+def serve(socket_path: Path, idle_timeout: float = _DAEMON_IDLE_TIMEOUT):
+    import socket
+    import socketserver
+
+    if socket_path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(socket_path))
+            print(f"daemon already listening on {socket_path}")
+            return
+        except OSError:
+            socket_path.unlink()
+        finally:
+            probe.close()
+
+    # plugins and lib.lib are loaded once, a checkout updated underneath a daemon
+    # retires it rather than keep serving the old code
+    stamps = _loaded_stamps()
+    output = _RequestOutput(sys.stdout)
+    sys.stdout = output
+    state = {"active": 0, "last": time.monotonic()}
+    state_lock = threading.Lock()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline()
+            if not line:
+                return
+            with state_lock:
+                state["active"] += 1
+            try:
+                response = self._dispatch(line)
+                self.wfile.write(json.dumps(response).encode() + b"\n")
+            finally:
+                with state_lock:
+                    state["active"] -= 1
+                    state["last"] = time.monotonic()
+
+        def _dispatch(self, line: bytes) -> dict:
+            status, error = 0, None
+            with output.capture() as buffer:
+                try:
+                    request = json.loads(line)
+                    mismatch = None
+                    if _stale_daemon(stamps):
+                        mismatch = (
+                            "code_mismatch",
+                            "daemon code changed since it started",
+                        )
+                        threading.Thread(target=server.shutdown, daemon=True).start()
+                    # lua encodes an empty table as []
+                    elif (request.get("env") or {}) != _daemon_env():
+                        mismatch = "env_mismatch", "daemon environment differs"
+                    if mismatch:
+                        key, error = mismatch
+                        return {
+                            "ok": False,
+                            "status": 1,
+                            "output": "",
+                            "error": error,
+                            key: True,
+                        }
+                    argv = request["argv"]
+                    if argv[:1] == ["serve"]:
+                        raise Exception("serve is not available through the daemon")
+                    run(["lib.py", *argv])
+                except SystemExit as e:
+                    status = e.code if isinstance(e.code, int) else 1
+                except Exception as e:
+                    status, error = 1, str(e) or type(e).__name__
+            return {
+                "ok": status == 0,
+                "status": status,
+                "output": buffer.getvalue(),
+                "error": error,
+            }
+
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+    server = socketserver.ThreadingUnixStreamServer(str(socket_path), Handler)
+    server.daemon_threads = True
+    socket_path.chmod(0o600)
+
+    def watch_idle():
+        while True:
+            time.sleep(1)
+            with state_lock:
+                idle = (
+                    state["active"] == 0
+                    and time.monotonic() - state["last"] > idle_timeout
+                )
+            if idle:
+                server.shutdown()
+                return
+
+    threading.Thread(target=watch_idle, daemon=True).start()
+    print(f"daemon listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        socket_path.unlink(missing_ok=True)
+        sys.stdout = output._default
+
+
+def _option(argv: list[str], name: str, default: str | None = None) -> str | None:
+    if name in argv[:-1]:
+        return argv[argv.index(name) + 1]
+    return default
+
+
+def run(argv: list[str]):
+    if "--trace" in argv[:-1]:
+        i = argv.index("--trace")
+        target = argv[i + 1]
+        _trace_target.set(target if target == "-" else os.path.abspath(target))
+        argv = argv[:i] + argv[i + 2 :]
+
+    if len(argv) < 3 and argv[1:2] not in (
+        ["list-plugins"],
+        ["serve"],
+        ["prefetch"],
+        ["gc"],
+    ):
         print("Usage:")
-        print("  list <plugin_name>")
+        print("  list <plugin_name> [--limit N]")
         print("  install <plugin_name> <version> <install_path>")
+        print("  install-many <manifest.json|manifest.toml> [--jobs N]")
+        print("  prefetch [plugin_name...] [--versions N] [--jobs N] [--limit-mbps N]")
+        print("  list-plugins")
+        print("  describe <plugin_name>...")
+        print("  bundle <output.pyz>")
+        print("  seed-helper <name> [binary]")
+        print("  gc")
+        print("  serve [--socket PATH] [--idle-timeout SECONDS]")
+        print(
+            "any command accepts --trace FILE (or MISE_ANIAAN_TRACE=FILE) "
+            "for JSON timing spans"
+        )
         sys.exit(1)
 
-    command = sys.argv[1]
-    plugin_name = sys.argv[2]
+    command = argv[1]
+    plugin_name = argv[2] if len(argv) > 2 else ""
 
-    if command == "list":
-        print(list_version(plugin_name))
+    if command == "list-plugins":
+        print(list_plugins())
+    elif command == "serve":
+        idle_timeout = _option(argv, "--idle-timeout", str(_DAEMON_IDLE_TIMEOUT))
+        serve(
+            Path(_option(argv, "--socket") or daemon_socket_path()),
+            idle_timeout=float(idle_timeout),  # type: ignore
+        )
+    elif command == "seed-helper":
+        # online: seed-helper minisign, offline: seed-helper minisign /path/to/minisign
+        if plugin_name not in _HELPER_VERSIONS or len(argv) > 4:
+            print(f"Usage: seed-helper <{'|'.join(_HELPER_VERSIONS)}> [binary]")
+            sys.exit(1)
+        version = _HELPER_VERSIONS[plugin_name]
+        if len(argv) == 4:
+            bin_path = seed_helper(plugin_name, version, Path(argv[3]))
+        else:
+            bin_path = helper_tool(plugin_name, version)
+        print(f"{plugin_name} {version}: {bin_path}")
+    elif command == "prefetch":
+        # plugins from argv or MISE_ANIAAN_PREFETCH="neovim zig ...", e.g. from cron
+        args = argv[2:]
+        names = [
+            arg
+            for i, arg in enumerate(args)
+            if not arg.startswith("--") and not (i and args[i - 1].startswith("--"))
+        ]
+        names = (
+            names
+            or os.environ.get("MISE_ANIAAN_PREFETCH", "").replace(",", " ").split()
+        )
+        if not names:
+            print(
+                "Usage: prefetch [plugin_name...] [--versions N] [--jobs N] "
+                "[--limit-mbps N]"
+            )
+            print("plugins default to MISE_ANIAAN_PREFETCH")
+            sys.exit(1)
+        limit_mbps = _option(argv, "--limit-mbps")
+        ok = prefetch(
+            names,
+            versions=int(_option(argv, "--versions", "1")),  # type: ignore
+            jobs=int(_option(argv, "--jobs", "2")),  # type: ignore
+            limit_mbps=float(limit_mbps) if limit_mbps else None,
+        )
+        if not ok:
+            sys.exit(1)
+    elif command == "gc":
+        removed, freed = gc_store()
+        print(f"gc: removed {removed} unreferenced files ({freed / 1024 / 1024:.1f}MB)")
+    elif command == "bundle":
+        output = Path(argv[2]).absolute()
+        build_bundle(output)
+        print(f"Bundle written to {output}")
+    elif command == "describe":
+        for name in argv[2:]:
+            print(describe_plugin(name))
+    elif command == "install-many":
+        jobs = 4
+        if len(argv) == 5 and argv[3] == "--jobs":
+            jobs = int(argv[4])
+        elif len(argv) != 3:
+            print("Usage: install-many <manifest.json|manifest.toml> [--jobs N]")
+            sys.exit(1)
+        if not install_many(load_manifest(Path(argv[2])), jobs=jobs):
+            sys.exit(1)
+    elif command == "list":
+        limit = None
+        if len(argv) == 5 and argv[3] == "--limit":
+            limit = int(argv[4])
+        print(list_version(plugin_name, limit=limit))
     elif command == "install":
-        if len(sys.argv) != 5:
+        if len(argv) != 5:
             print("Usage: install <plugin_name> <version> <install_path>")
             sys.exit(1)
-        version = sys.argv[3]
-        install_path = os.path.abspath(sys.argv[4])
+        version = argv[3]
+        install_path = os.path.abspath(argv[4])
         install_version(plugin_name, version, install_path)
     else:
         print(f"Unknown command: {command}")
-        print("Available commands: list, install")
+        print(
+            "Available commands: list, install, install-many, prefetch, list-plugins, "
+            "describe, bundle, serve, seed-helper, gc"
+        )
         sys.exit(1)
 
 
+def main():
+    sources_dir = _stale_bundle()
+    if sources_dir:
+        # the updated sources run this call and rebuild the bundle, so only the
+        # first call after an update pays for a second interpreter
+        bundle = Path(__file__).parent.parent
+        print(f"{bundle} is older than {sources_dir}, rebuilding it", file=sys.stderr)
+        os.environ["MISE_ANIAAN_REBUILD_BUNDLE"] = str(bundle)
+        os.execv(sys.executable, [sys.executable, str(sources_dir), *sys.argv[1:]])
+
+    bundle = os.environ.pop("MISE_ANIAAN_REBUILD_BUNDLE", None)
+    if bundle and (Path(__file__).parent / "plugins").is_dir():
+        try:
+            build_bundle(Path(bundle))
+        except Exception as e:
+            print(f"failed to rebuild {bundle}: {e}", file=sys.stderr)
+    run(sys.argv)
+
+
 if __name__ == "__main__":
     main()
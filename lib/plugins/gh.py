@@ -5,17 +5,18 @@ parent_dir = Path(__file__).parent.parent.parent
 if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
-import shutil
+from lib.lib import FormatKwargs, Plugin, promote_tree
 
-from lib.lib import FormatKwargs, Plugin
+
+def _folder(format_kwargs: FormatKwargs) -> str:
+    return format_kwargs["filename"].removesuffix(".tar.gz").removesuffix(".zip")
 
 
 def _copy(plugin: Plugin, src: Path, dst: Path, format_kwargs: FormatKwargs):
-    folder = format_kwargs["filename"].removesuffix(".tar.gz").removesuffix(".zip")
-    src = src / folder
+    src = src / _folder(format_kwargs)
     if not src.exists():
         raise Exception(f"Source path {src} does not exist")
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    promote_tree(src, dst)
     cmd = dst / "bin" / plugin.cmd
     cmd.chmod(0o755)
 
@@ -45,4 +46,5 @@ PLUGIN = Plugin(
     bin_path="gh",
     recover_raw_version=lambda x: f"v{x}",
     custom_copy=_copy,
+    extract_members=lambda kwargs: f"{_folder(kwargs)}/",
 )
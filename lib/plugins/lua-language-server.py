@@ -1,20 +1,19 @@
 import sys
 from pathlib import Path
-import shutil
 
 
 parent_dir = Path(__file__).parent.parent.parent
 if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
-from lib.lib import Plugin, FormatKwargs
+from lib.lib import Plugin, FormatKwargs, promote_tree
 
 
 def _copy(plugin: Plugin, src: Path, dst: Path, format_kwargs: FormatKwargs):
     # src = src / f"{format_kwargs['filename'].removesuffix('.tar.gz')}/"
     if not src.exists():
         raise Exception(f"Source path {src} does not exist")
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    promote_tree(src, dst)
     cmd = dst / "bin" / plugin.cmd
     cmd.chmod(0o755)
 
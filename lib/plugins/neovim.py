@@ -1,4 +1,3 @@
-import shutil
 import sys
 from pathlib import Path
 
@@ -6,14 +5,14 @@ parent_dir = Path(__file__).parent.parent.parent
 if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
-from lib.lib import GITHUB_CHECKER_FLAG, FormatKwargs, Plugin
+from lib.lib import GITHUB_CHECKER_FLAG, FormatKwargs, Plugin, promote_tree
 
 
 def _copy(plugin: Plugin, src: Path, dst: Path, format_kwargs: FormatKwargs):
     src = src / f"{format_kwargs['filename'].rstrip('.tar.gz')}/"
     if not src.exists():
         raise Exception(f"Source path {src} does not exist")
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    promote_tree(src, dst)
     cmd = dst / "bin" / plugin.cmd
     cmd.chmod(0o755)
 
@@ -35,4 +34,5 @@ PLUGIN = Plugin(
     bin_path=lambda kwargs: f"{kwargs['filename'].rstrip('.tar.gz')}/bin/nvim",
     recover_raw_version=lambda x: f"v{x}" if x[0].isdigit() else x,
     custom_copy=_copy,
+    extract_members=lambda kwargs: f"{kwargs['filename'].rstrip('.tar.gz')}/",
 )
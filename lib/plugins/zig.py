@@ -1,24 +1,27 @@
-import shutil
 import sys
 from pathlib import Path
 
-from packaging import version
-
 parent_dir = Path(__file__).parent.parent.parent
 if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
-from lib.lib import FormatKwargs, Plugin, verify_by_minisign
+from lib.lib import FormatKwargs, Plugin, promote_tree, verify_by_minisign
 
 _PUBLIC_KEY = "RWSGOq2NVecA2UPNdBUZykf1CCb147pkmdtYxgb3Ti+JO/wCYvhbAb/U"
 
 
+def _sort_version_key(release: dict):
+    from packaging import version
+
+    return version.parse(release["tag_name"].lstrip("v"))
+
+
 def _copy(plugin: Plugin, src: Path, dst: Path, format_kwargs: FormatKwargs):
     src = src / Path(f"{format_kwargs['filename'].rstrip('.tar.xz')}").name
     if not src.exists():
         raise Exception(f"Source path {src} does not exist")
     dst = dst / "bin"
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    promote_tree(src, dst)
     cmd = dst / plugin.cmd
     cmd.chmod(0o755)
 
@@ -41,5 +44,6 @@ PLUGIN = Plugin(
         format_kwargs=format_kwargs,
     ),
     custom_copy=_copy,
-    sort_version_key=lambda x: version.parse(x["tag_name"].lstrip("v")),
+    extract_members=lambda kwargs: f"{Path(kwargs['filename'].rstrip('.tar.xz')).name}/",
+    sort_version_key=_sort_version_key,
 )
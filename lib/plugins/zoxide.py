@@ -1,4 +1,3 @@
-import shutil
 import sys
 from pathlib import Path
 
@@ -6,7 +5,7 @@ parent_dir = Path(__file__).parent.parent.parent
 if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
-from lib.lib import FormatKwargs, Plugin
+from lib.lib import FormatKwargs, Plugin, promote_tree
 
 
 def _copy(plugin: Plugin, src: Path, dst: Path, format_kwargs: FormatKwargs):
@@ -14,7 +13,7 @@ def _copy(plugin: Plugin, src: Path, dst: Path, format_kwargs: FormatKwargs):
     if not src.exists():
         raise Exception(f"Source path {src} does not exist")
     dst = dst / "bin"
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    promote_tree(src, dst)
     cmd = dst / plugin.cmd
     cmd.chmod(0o755)
 